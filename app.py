@@ -4,25 +4,38 @@ import sqlite3
 import logging
 import openai 
 import json 
+import time
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 
-from flask import Flask, render_template, request, redirect, url_for, flash, send_file, g, jsonify
+from flask import Flask, render_template, request, redirect, url_for, flash, g, jsonify, Response, session, make_response
 from werkzeug.utils import secure_filename
-from datetime import datetime
-from ics import Calendar, Event
-import dateparser
+from werkzeug.http import is_resource_modified
+from datetime import datetime, timedelta, timezone
 
 # Custom modules
-from database import get_db_connection, init_db 
-from transcription import transcribe_audio, load_whisper_model
+from database import (get_db_connection, init_db, make_summary_preview, save_transcript, load_transcript,
+                      bump_meeting_version, bump_data_version, get_meeting_version, get_data_version, parse_due_date,
+                      store_action_item, delete_meeting_action_items, bump_action_item_meetings, count_live_processing_workers,
+                      IN_PROGRESS_STATUSES)
+from ics_feed import render_action_items_calendar
 from nlp_processor import generate_summary, extract_action_items, extract_decisions
+from metrics import render_metrics, start_snapshot_writer, UPLOAD_SIZE_BYTES, DB_QUERY_SECONDS, PROCESSING_STAGE_SECONDS, PROCESSING_QUEUE_DEPTH
 
 # Configuration
 UPLOAD_FOLDER = 'uploads'
 ALLOWED_EXTENSIONS = {'mp3', 'wav', 'm4a', 'mp4', 'ogg', 'flac', 'webm'}
+MEETINGS_PAGE_SIZE = 25
+# 'inline': uploads are processed on a thread pool in this process (the default, and what `python app.py` uses).
+# 'external': this process only queues meetings; processing_worker.py processes claim them (see serve.py).
+PROCESSING_MODE = os.getenv('PROCESSING_MODE', 'inline').lower()
+# Everything but the legacy inline transcript column; transcripts are loaded from meeting_content on demand.
+MEETING_COLUMNS = "id, filename, upload_time, summary, processing_status, meeting_title, scheduled_datetime, end_datetime, agenda, attendees, summary_preview"
 
 app = Flask(__name__)
 app.config['UPLOAD_FOLDER'] = UPLOAD_FOLDER
-app.config['SECRET_KEY'] = os.urandom(24)
+app.config['SECRET_KEY'] = os.getenv('SECRET_KEY') or os.urandom(24) # multi-process servers must share one key (serve.py sets it)
 app.config['MAX_CONTENT_LENGTH'] = 100 * 1024 * 1024
 
 logger = logging.getLogger(__name__) 
@@ -33,23 +46,122 @@ def allowed_file(filename):
 with app.app_context():
     init_db() 
     logger.info("Database initialized/verified by app.py.")
-    load_whisper_model()
+    if PROCESSING_MODE == 'inline':
+        from transcription import load_whisper_model # Whisper/torch are only imported where meetings are transcribed
+        load_whisper_model()
+start_snapshot_writer() # shares this process's metrics when METRICS_DIR is set (serve.py sets it)
 
 @app.teardown_appcontext
 def close_connection(exception):
     db = getattr(g, '_database', None)
     if db is not None: db.close()
 
+@app.teardown_request
+def record_db_time(exception):
+    db = getattr(g, '_database', None)
+    if db is not None: DB_QUERY_SECONDS.observe(db.query_seconds, route=request.endpoint or 'unknown')
+
 def get_db():
     db = getattr(g, '_database', None)
     if db is None: db = g._database = get_db_connection()
     return db
 
+# --- HTTP caching ---
+RESPONSE_CACHE_MAX_ENTRIES = 256
+RESPONSE_CACHE_MAX_BYTES = int(os.getenv('RESPONSE_CACHE_MAX_BYTES', 64 * 1024 * 1024)) # per process; 0 disables the cache
+RESPONSE_CACHE_MAX_ENTRY_BYTES = 4 * 1024 * 1024 # larger pages are rendered on each miss; revalidation still answers 304
+_response_cache = OrderedDict() # (endpoint, etag, host) -> (body bytes, mimetype), least recently used first
+_response_cache_bytes = 0
+_response_cache_lock = threading.Lock()
+
+def clear_response_cache():
+    global _response_cache_bytes
+    with _response_cache_lock: _response_cache.clear(); _response_cache_bytes = 0
+
+def _store_cached_response(cache_key, body, mimetype):
+    global _response_cache_bytes
+    if len(body) > min(RESPONSE_CACHE_MAX_ENTRY_BYTES, RESPONSE_CACHE_MAX_BYTES): return
+    with _response_cache_lock:
+        previous = _response_cache.pop(cache_key, None)
+        if previous is not None: _response_cache_bytes -= len(previous[0])
+        _response_cache[cache_key] = (body, mimetype); _response_cache_bytes += len(body)
+        while len(_response_cache) > RESPONSE_CACHE_MAX_ENTRIES or _response_cache_bytes > RESPONSE_CACHE_MAX_BYTES:
+            _response_cache_bytes -= len(_response_cache.popitem(last=False)[1][0])
+
+def conditional_response(etag, last_modified, render):
+    """
+    Serves render() with ETag/Last-Modified validators taken from a meeting or data version counter.
+
+    Conditional GETs that still match are answered with 304 before render() runs, and rendered bodies are
+    kept in a small in-process LRU, so each version of a page is rendered once. The cache key is the endpoint and
+    the ETag, which already encodes every argument the view reads (owner, date range, meeting id), so arbitrary
+    query strings cannot add entries; the host is included because some bodies hold absolute URLs. The LRU is
+    bounded by total bytes and skips bodies above RESPONSE_CACHE_MAX_ENTRY_BYTES.
+    Pages with pending flash messages are rendered fresh and never cached, since the flash is part of the body.
+    """
+    if session.get('_flashes'):
+        response = make_response(render()); response.headers['Cache-Control'] = 'no-store'
+        return response
+    if last_modified is not None: last_modified = last_modified.replace(tzinfo=timezone.utc, microsecond=0)
+    if not is_resource_modified(request.environ, etag=etag, last_modified=last_modified):
+        response = Response(status=304)
+    else:
+        cache_key = (request.endpoint, etag, request.host_url)
+        with _response_cache_lock:
+            cached = _response_cache.get(cache_key)
+            if cached is not None: _response_cache.move_to_end(cache_key)
+        if cached is not None:
+            response = Response(cached[0], mimetype=cached[1])
+        else:
+            response = make_response(render())
+            if response.status_code != 200: return response
+            _store_cached_response(cache_key, response.get_data(), response.mimetype)
+    response.set_etag(etag)
+    if last_modified is not None: response.last_modified = last_modified
+    response.headers['Cache-Control'] = 'no-cache' # browsers may keep the page but must revalidate it
+    return response
+
+# --- Background processing ---
+# Whisper is CPU-bound and shares one model, so by default meetings are processed one at a time.
+PROCESSING_EXECUTOR = ThreadPoolExecutor(max_workers=int(os.getenv('PROCESSING_WORKERS', '1')), thread_name_prefix='processing')
+
+def run_processing_job(meeting_id):
+    """Processes a created meeting from what is stored for it. Used by the inline executor and by worker processes."""
+    cursor = get_db().cursor()
+    cursor.execute("SELECT filename, meeting_title, processing_job FROM meetings WHERE id = ?", (meeting_id,)); meeting = cursor.fetchone()
+    if meeting is None: logger.warning(f"Processing job for meeting {meeting_id} skipped: meeting no longer exists."); return None
+    if meeting['processing_job'] == 'text':
+        return process_text_input(meeting_id, load_transcript(cursor, meeting_id), meeting['meeting_title'])
+    return process_audio_file(meeting_id, os.path.join(app.config['UPLOAD_FOLDER'], meeting['filename']), meeting['filename'], meeting['meeting_title'])
+
+def submit_processing(meeting_id):
+    """Hands a created meeting to processing: the in-process executor, or the queue that worker processes claim from."""
+    if PROCESSING_MODE == 'external':
+        db = get_db(); cursor = db.cursor()
+        cursor.execute("UPDATE meetings SET processing_status = 'queued', processing_attempts = 0 WHERE id = ?", (meeting_id,)); bump_meeting_version(cursor, meeting_id); db.commit()
+        return None
+    PROCESSING_QUEUE_DEPTH.inc()
+    def job():
+        try:
+            with app.app_context(): run_processing_job(meeting_id)
+        except Exception as e: logger.error(f"Background processing job for meeting {meeting_id} crashed: {e}", exc_info=True)
+        finally: PROCESSING_QUEUE_DEPTH.dec()
+    return PROCESSING_EXECUTOR.submit(job)
+
+def _progress_recorder(meeting_id):
+    """Returns a transcription progress callback that stores the percent on the meeting row for the events stream."""
+    last_percent = [-1]
+    def record(percent):
+        if percent == last_percent[0]: return
+        last_percent[0] = percent
+        try:
+            db = get_db(); db.execute("UPDATE meetings SET progress_percent = ? WHERE id = ?", (percent, meeting_id)); db.commit()
+        except sqlite3.Error as e: logger.warning(f"Could not record progress {percent}% for meeting {meeting_id}: {e}")
+    return record
+
 # --- MODIFIED HELPER FUNCTION FOR AUDIO PROCESSING ---
-def process_audio_file(filepath, actual_stored_filename, user_provided_title=None, original_uploaded_filename_for_default_title=None):
-    meeting_id = None; summary_result = "ERROR: Initial processing error." 
-    action_items_data = []; decisions_from_nlp = []; nlp_error_occurred = True 
-    
+def create_audio_meeting(filepath, actual_stored_filename, user_provided_title=None, original_uploaded_filename_for_default_title=None):
+    """Creates the meeting record for a saved audio file. Returns (meeting_id, final_meeting_title)."""
     current_time_for_title = datetime.now()
     current_dt_str = current_time_for_title.strftime('%Y-%m-%d %H:%M')
 
@@ -65,69 +177,92 @@ def process_audio_file(filepath, actual_stored_filename, user_provided_title=Non
             final_meeting_title = f"Uploaded File ({current_dt_str})"
         logger.info(f"No user title for audio, generated default: '{final_meeting_title}' (based on file: '{actual_stored_filename}')")
 
+    if os.path.exists(filepath): UPLOAD_SIZE_BYTES.observe(os.path.getsize(filepath))
+    db = get_db(); cursor = db.cursor()
+    cursor.execute("""
+        INSERT INTO meetings (filename, processing_status, upload_time, meeting_title, processing_job) 
+        VALUES (?, ?, ?, ?, ?)
+        """, (actual_stored_filename, 'uploaded', current_time_for_title, final_meeting_title, 'audio'))
+    meeting_id = cursor.lastrowid; bump_meeting_version(cursor, meeting_id); db.commit()
+    logger.info(f"PROCESSED: Meeting record created ID: {meeting_id} for file '{actual_stored_filename}' with DB title '{final_meeting_title}'.")
+    return meeting_id, final_meeting_title
+
+def process_audio_file(meeting_id, filepath, actual_stored_filename, final_meeting_title):
+    summary_result = "ERROR: Initial processing error." 
+    action_items_data = []; decisions_from_nlp = []; nlp_error_occurred = True 
     try:
         db = get_db(); cursor = db.cursor()
-        cursor.execute("""
-            INSERT INTO meetings (filename, processing_status, upload_time, meeting_title) 
-            VALUES (?, ?, ?, ?)
-            """, (actual_stored_filename, 'uploaded', current_time_for_title, final_meeting_title))
-        meeting_id = cursor.lastrowid; db.commit()
-        logger.info(f"PROCESSED: Meeting record created ID: {meeting_id} for file '{actual_stored_filename}' with DB title '{final_meeting_title}'.")
-        
-        cursor.execute("UPDATE meetings SET processing_status = ? WHERE id = ?", ('transcribing', meeting_id)); db.commit()
-        transcript_text = transcribe_audio(filepath)
+        cursor.execute("UPDATE meetings SET processing_status = ?, progress_percent = 0 WHERE id = ?", ('transcribing', meeting_id)); bump_meeting_version(cursor, meeting_id); db.commit()
+        from transcription import transcribe_audio
+        stage_start = time.perf_counter()
+        transcript_text = transcribe_audio(filepath, progress_callback=_progress_recorder(meeting_id))
+        PROCESSING_STAGE_SECONDS.observe(time.perf_counter() - stage_start, stage='transcription')
 
         if not transcript_text:
             summary_result = 'ERROR: Transcription failed.'
-            cursor.execute("UPDATE meetings SET processing_status = ?, transcript = ?, summary = ? WHERE id = ?", 
-                           ('error', 'Transcription failed.', summary_result, meeting_id)); db.commit() # meeting_title already set
+            save_transcript(cursor, meeting_id, 'Transcription failed.')
+            cursor.execute("UPDATE meetings SET processing_status = ?, summary = ?, summary_preview = ? WHERE id = ?", 
+                           ('error', summary_result, make_summary_preview(summary_result), meeting_id)); bump_meeting_version(cursor, meeting_id); db.commit() # meeting_title already set
             logger.error(f"PROCESSED: Transcription failed for ID {meeting_id}.")
             return {'status': 'error', 'message': summary_result, 'meeting_id': meeting_id, 'summary':summary_result, 'action_items':[], 'decisions':[], 'meeting_title': final_meeting_title}
         
-        cursor.execute("UPDATE meetings SET transcript = ?, processing_status = ? WHERE id = ?", 
-                       (transcript_text, 'processing_nlp', meeting_id)); db.commit()
+        save_transcript(cursor, meeting_id, transcript_text)
+        cursor.execute("UPDATE meetings SET processing_status = ?, progress_percent = 100 WHERE id = ?", ('processing_nlp', meeting_id)); bump_meeting_version(cursor, meeting_id); db.commit()
         logger.info(f"PROCESSED: Transcription OK for ID {meeting_id}. Length: {len(transcript_text)}. Status to 'processing_nlp'.")
 
-        summary_result = generate_summary(transcript_text)
-        action_items_data = extract_action_items(transcript_text)
-        decisions_from_nlp = extract_decisions(transcript_text) 
-        nlp_error_occurred = summary_result.startswith("ERROR:")
-        
-        current_db_status = 'error' if nlp_error_occurred else 'completed'
-               
-        # The final_meeting_title is now either user-provided or the "Mode (timestamp)" default.
-        cursor.execute("UPDATE meetings SET summary = ?, processing_status = ?, meeting_title = ? WHERE id = ?", 
-                       (summary_result, current_db_status, final_meeting_title, meeting_id))
-        
-        for item in action_items_data: 
-            cursor.execute("INSERT INTO action_items (meeting_id, task, owner, due_date) VALUES (?, ?, ?, ?)", (meeting_id, item.get('task'), item.get('owner'), item.get('due_date')))
-        for decision_text in decisions_from_nlp: 
-            cursor.execute("INSERT INTO decisions (meeting_id, decision_text) VALUES (?, ?)", (meeting_id, decision_text)) 
-        db.commit()
-        
-        cursor.execute("SELECT id, decision_text, status, resolution_notes FROM decisions WHERE meeting_id = ?", (meeting_id,))
-        processed_decisions_for_return = [dict(row) for row in cursor.fetchall()]
-        logger.info(f"PROCESSED: NLP stage for ID {meeting_id} finished. Error: {nlp_error_occurred}. Summary: '{summary_result[:50]}...'")
-        return {'status': 'success', 'meeting_id': meeting_id, 'summary': summary_result, 
-                'action_items': action_items_data, 'decisions': processed_decisions_for_return, 
-                'nlp_error': nlp_error_occurred, 'filename': actual_stored_filename, 'meeting_title': final_meeting_title}
+        return _run_nlp_stage(cursor, meeting_id, transcript_text, final_meeting_title, actual_stored_filename, "PROCESSED")
     except openai.AuthenticationError as e:
         error_msg = f"ERROR: OpenAI Auth Error: {e}"; logger.critical(f"PROCESSED (ID {meeting_id or 'N/A'}): {error_msg}", exc_info=False)
         if meeting_id:
-            try: db=get_db();cur=db.cursor();cur.execute("UPDATE meetings SET summary = ?, processing_status = ? WHERE id = ?", (error_msg, 'error', meeting_id));db.commit()
+            try: db=get_db();cur=db.cursor();cur.execute("UPDATE meetings SET summary = ?, summary_preview = ?, processing_status = ? WHERE id = ?", (error_msg, make_summary_preview(error_msg), 'error', meeting_id));bump_meeting_version(cur, meeting_id);db.commit()
             except: pass 
         return {'status': 'error', 'message': error_msg, 'meeting_id': meeting_id, 'summary':error_msg, 'action_items':[], 'decisions':[], 'meeting_title': final_meeting_title}
     except Exception as e:
         error_msg = f"ERROR: Unexpected error processing {actual_stored_filename} (ID {meeting_id or 'N/A'}): {e}"; logger.error(error_msg, exc_info=True)
         if meeting_id:
-            try: db=get_db();cur=db.cursor();cur.execute("UPDATE meetings SET summary = ?, processing_status = ? WHERE id = ?", (f"Proc. Error: {str(e)[:250]}", 'error', meeting_id));db.commit()
+            try: db=get_db();cur=db.cursor();cur.execute("UPDATE meetings SET summary = ?, summary_preview = ?, processing_status = ? WHERE id = ?", (f"Proc. Error: {str(e)[:250]}", make_summary_preview(f"Proc. Error: {str(e)[:250]}"), 'error', meeting_id));bump_meeting_version(cur, meeting_id);db.commit()
             except: pass 
         return {'status': 'error', 'message': f'Unexpected error: {str(e)[:100]}...', 'meeting_id': meeting_id, 'summary':f"Proc. Error: {str(e)[:250]}", 'action_items':[], 'decisions':[], 'meeting_title': final_meeting_title}
 
+def _run_nlp_stage(cursor, meeting_id, transcript_text, final_meeting_title, filename, log_prefix):
+    """Summary, action items and decisions for a transcribed meeting. The summary is stored as soon as it exists so
+    the events stream can show it while the extractors are still running."""
+    db = cursor.connection
+    stage_start = time.perf_counter()
+    summary_result = generate_summary(transcript_text)
+    cursor.execute("UPDATE meetings SET summary = ?, summary_preview = ? WHERE id = ?", 
+                   (summary_result, make_summary_preview(summary_result), meeting_id)); bump_meeting_version(cursor, meeting_id); db.commit()
+    action_items_data = extract_action_items(transcript_text)
+    decisions_from_nlp = extract_decisions(transcript_text) 
+    PROCESSING_STAGE_SECONDS.observe(time.perf_counter() - stage_start, stage='nlp')
+    nlp_error_occurred = summary_result.startswith("ERROR:")
+    
+    current_db_status = 'error' if nlp_error_occurred else 'completed'
+           
+    # The final_meeting_title is now either user-provided or the "Mode (timestamp)" default.
+    cursor.execute("UPDATE meetings SET processing_status = ?, meeting_title = ? WHERE id = ?", 
+                   (current_db_status, final_meeting_title, meeting_id))
+    
+    cursor.execute("SELECT scheduled_datetime, upload_time FROM meetings WHERE id = ?", (meeting_id,)); meeting_times = cursor.fetchone()
+    due_date_base = (meeting_times['scheduled_datetime'] or meeting_times['upload_time']) if meeting_times else None # relative dates count from the meeting
+    duplicates_linked = 0
+    for item in action_items_data: 
+        _, is_duplicate = store_action_item(cursor, meeting_id, item.get('task'), item.get('owner'), item.get('due_date'), parse_due_date(item.get('due_date'), due_date_base))
+        duplicates_linked += is_duplicate
+    for decision_text in decisions_from_nlp: 
+        cursor.execute("INSERT INTO decisions (meeting_id, decision_text) VALUES (?, ?)", (meeting_id, decision_text)) 
+    bump_meeting_version(cursor, meeting_id); db.commit()
+    
+    cursor.execute("SELECT id, decision_text, status, resolution_notes FROM decisions WHERE meeting_id = ?", (meeting_id,))
+    processed_decisions_for_return = [dict(row) for row in cursor.fetchall()]
+    logger.info(f"{log_prefix}: NLP stage for ID {meeting_id} finished. Error: {nlp_error_occurred}. {duplicates_linked}/{len(action_items_data)} action items linked to existing ones. Summary: '{summary_result[:50]}...'")
+    return {'status': 'success', 'meeting_id': meeting_id, 'summary': summary_result, 
+            'action_items': action_items_data, 'decisions': processed_decisions_for_return, 
+            'nlp_error': nlp_error_occurred, 'filename': filename, 'meeting_title': final_meeting_title}
+
 # --- MODIFIED HELPER FUNCTION FOR TEXT TRANSCRIPT PROCESSING ---
-def process_text_input(transcript_text, user_provided_title=None):
-    meeting_id = None; summary_result = "ERROR: Initial processing error." 
-    action_items_data = []; decisions_from_nlp = []; nlp_error_occurred = True
+def create_text_meeting(transcript_text, user_provided_title=None):
+    """Creates the meeting record (and stored transcript) for pasted text. Returns (meeting_id, final_meeting_title)."""
     current_time_for_title = datetime.now()
     current_dt_str = current_time_for_title.strftime('%Y-%m-%d %H:%M')
 
@@ -140,49 +275,35 @@ def process_text_input(transcript_text, user_provided_title=None):
     
     placeholder_filename = f"text_input_{current_time_for_title.strftime('%Y%m%d%H%M%S')}.txt"
 
+    db = get_db(); cursor = db.cursor()
+    cursor.execute("""
+        INSERT INTO meetings (filename, processing_status, upload_time, meeting_title, processing_job) 
+        VALUES (?, ?, ?, ?, ?)
+        """, (placeholder_filename, 'uploaded', current_time_for_title, final_meeting_title, 'text'))
+    meeting_id = cursor.lastrowid; save_transcript(cursor, meeting_id, transcript_text); bump_meeting_version(cursor, meeting_id); db.commit()
+    logger.info(f"TEXT_PROC: Meeting record ID: {meeting_id}, Title: '{final_meeting_title}', Placeholder Filename: '{placeholder_filename}'.")
+    return meeting_id, final_meeting_title
+
+def process_text_input(meeting_id, transcript_text, final_meeting_title):
     try:
         db = get_db(); cursor = db.cursor()
-        cursor.execute("""
-            INSERT INTO meetings (filename, transcript, processing_status, upload_time, meeting_title) 
-            VALUES (?, ?, ?, ?, ?)
-            """, (placeholder_filename, transcript_text, 'processing_nlp', current_time_for_title, final_meeting_title))
-        meeting_id = cursor.lastrowid; db.commit()
-        logger.info(f"TEXT_PROC: Meeting record ID: {meeting_id}, Title: '{final_meeting_title}', Placeholder Filename: '{placeholder_filename}'. Status 'processing_nlp'.")
-
-        summary_result = generate_summary(transcript_text)
-        action_items_data = extract_action_items(transcript_text)
-        decisions_from_nlp = extract_decisions(transcript_text) 
-        nlp_error_occurred = summary_result.startswith("ERROR:")
-        current_db_status = 'error' if nlp_error_occurred else 'completed'
-        
-        cursor.execute("UPDATE meetings SET summary = ?, processing_status = ?, meeting_title = ? WHERE id = ?", 
-                       (summary_result, current_db_status, final_meeting_title, meeting_id)) # Use the already set final_meeting_title
-        
-        for item in action_items_data: 
-            cursor.execute("INSERT INTO action_items (meeting_id, task, owner, due_date) VALUES (?, ?, ?, ?)", (meeting_id, item.get('task'), item.get('owner'), item.get('due_date')))
-        for decision_text in decisions_from_nlp: 
-            cursor.execute("INSERT INTO decisions (meeting_id, decision_text) VALUES (?, ?)", (meeting_id, decision_text)) 
-        db.commit()
-        
-        cursor.execute("SELECT id, decision_text, status, resolution_notes FROM decisions WHERE meeting_id = ?", (meeting_id,))
-        processed_decisions_for_return = [dict(row) for row in cursor.fetchall()]
-        logger.info(f"TEXT_PROC: NLP stage for ID {meeting_id} finished. Error: {nlp_error_occurred}.")
-        return {'status': 'success', 'meeting_id': meeting_id, 'summary': summary_result, 'action_items': action_items_data, 'decisions': processed_decisions_for_return, 'nlp_error': nlp_error_occurred, 'filename': placeholder_filename, 'meeting_title': final_meeting_title}
+        cursor.execute("UPDATE meetings SET processing_status = ? WHERE id = ?", ('processing_nlp', meeting_id)); bump_meeting_version(cursor, meeting_id); db.commit()
+        cursor.execute("SELECT filename FROM meetings WHERE id = ?", (meeting_id,)); placeholder_filename = cursor.fetchone()['filename']
+        return _run_nlp_stage(cursor, meeting_id, transcript_text, final_meeting_title, placeholder_filename, "TEXT_PROC")
     # ... (rest of process_text_input's except blocks - same as your provided version) ...
     except openai.AuthenticationError as e:
         error_msg = f"ERROR: OpenAI Auth Error: {e}"; logger.critical(f"TEXT_PROC (ID {meeting_id or 'N/A'}): {error_msg}", exc_info=False)
         if meeting_id:
-            try: db_err_conn=get_db();cur_err=db_err_conn.cursor();cur_err.execute("UPDATE meetings SET summary = ?, processing_status = ? WHERE id = ?", (error_msg, 'error', meeting_id));db_err_conn.commit()
+            try: db_err_conn=get_db();cur_err=db_err_conn.cursor();cur_err.execute("UPDATE meetings SET summary = ?, summary_preview = ?, processing_status = ? WHERE id = ?", (error_msg, make_summary_preview(error_msg), 'error', meeting_id));bump_meeting_version(cur_err, meeting_id);db_err_conn.commit()
             except Exception as db_e_auth: logger.error(f"DB error on auth fail for {meeting_id}: {db_e_auth}")
         return {'status': 'error', 'message': error_msg, 'meeting_id': meeting_id, 'summary':error_msg, 'action_items':[], 'decisions':[], 'meeting_title': final_meeting_title}
     except Exception as e:
         error_msg = f"ERROR: Unexpected error processing text input (ID {meeting_id or 'N/A'}): {e}"; logger.error(error_msg, exc_info=True)
         if meeting_id:
-            try: db_err_conn=get_db();cur_err=db_err_conn.cursor();cur_err.execute("UPDATE meetings SET summary = ?, processing_status = ? WHERE id = ?", (f"Proc. Error: {str(e)[:250]}", 'error', meeting_id));db_err_conn.commit()
+            try: db_err_conn=get_db();cur_err=db_err_conn.cursor();cur_err.execute("UPDATE meetings SET summary = ?, summary_preview = ?, processing_status = ? WHERE id = ?", (f"Proc. Error: {str(e)[:250]}", make_summary_preview(f"Proc. Error: {str(e)[:250]}"), 'error', meeting_id));bump_meeting_version(cur_err, meeting_id);db_err_conn.commit()
             except Exception as db_e_gen: logger.error(f"DB error on general fail for {meeting_id}: {db_e_gen}")
         return {'status': 'error', 'message': f'Unexpected error: {str(e)[:100]}...', 'meeting_id': meeting_id, 'summary':f"Proc. Error: {str(e)[:250]}", 'action_items':[], 'decisions':[], 'meeting_title': final_meeting_title}
 
-
 # --- Routes ---
 @app.route('/', methods=['GET', 'POST'])
 def index():
@@ -201,23 +322,26 @@ def index():
             try:
                 if not os.path.exists(app.config['UPLOAD_FOLDER']): os.makedirs(app.config['UPLOAD_FOLDER'])
                 file.save(filepath); logger.info(f"Uploaded '{original_uploaded_filename}' to {filepath} (stored as {storage_filename})")
-                result = process_audio_file(filepath, storage_filename, user_meeting_title_upload, original_uploaded_filename_for_default_title=original_uploaded_filename) 
-                if result['status'] == 'success':
-                    display_title = result.get('meeting_title', result.get("filename", "Meeting"))
-                    flash_msg = f'Meeting "{display_title}" processed.' + (" Issues with NLP." if result.get('nlp_error') else "")
-                    flash(flash_msg, 'warning' if result.get('nlp_error') else 'success')
-                    return redirect(url_for('meeting_detail', meeting_id=result['meeting_id']))
-                else:
-                    flash(f"Error processing {original_uploaded_filename}: {result.get('message', 'Unknown error')}", 'danger')
-                    return redirect(url_for('index'))
+                meeting_id, display_title = create_audio_meeting(filepath, storage_filename, user_meeting_title_upload, original_uploaded_filename_for_default_title=original_uploaded_filename) 
+                submit_processing(meeting_id)
+                flash(f'Meeting "{display_title}" uploaded. Processing has started; this page updates as it progresses.', 'info')
+                return redirect(url_for('meeting_detail', meeting_id=meeting_id))
             except Exception as e: 
                 logger.error(f"Error handling upload of {original_uploaded_filename}: {e}", exc_info=True)
                 flash(f'Upload Error: {str(e)}', 'danger'); return redirect(request.url)
         else: 
             flash('File type not allowed or invalid file.', 'warning'); return redirect(request.url)
     db = get_db(); cursor = db.cursor()
-    cursor.execute("SELECT id, filename, upload_time, processing_status, summary, meeting_title FROM meetings ORDER BY upload_time DESC, id DESC")
+    # Keyset pagination over idx_meetings_upload_time: the page cost does not grow with the number of meetings.
+    # upload_time is read back as raw TEXT for the cursor, since stored values mix ISO and SQLite timestamp formats.
+    before_time = request.args.get('before'); before_id = request.args.get('before_id', type=int)
+    list_columns = "SELECT id, filename, upload_time, CAST(upload_time AS TEXT) AS upload_time_key, processing_status, summary_preview, meeting_title FROM meetings"
+    if before_time and before_id is not None:
+        cursor.execute(f"{list_columns} WHERE (upload_time, id) < (?, ?) ORDER BY upload_time DESC, id DESC LIMIT ?", (before_time, before_id, MEETINGS_PAGE_SIZE + 1))
+    else:
+        cursor.execute(f"{list_columns} ORDER BY upload_time DESC, id DESC LIMIT ?", (MEETINGS_PAGE_SIZE + 1,))
     meetings_raw = cursor.fetchall()
+    has_older = len(meetings_raw) > MEETINGS_PAGE_SIZE; meetings_raw = meetings_raw[:MEETINGS_PAGE_SIZE]
     meetings_list = []
     for m_raw in meetings_raw:
         m_item = dict(m_raw); display_time = m_item.get('upload_time') 
@@ -232,7 +356,8 @@ def index():
         else: m_item['display_time_for_list'] = display_time
         m_item['display_title_for_list'] = m_item.get('meeting_title') or m_item.get('filename') or "Untitled Meeting"
         meetings_list.append(m_item)
-    return render_template('index.html', meetings=meetings_list)
+    older_page_args = {'before': meetings_list[-1]['upload_time_key'], 'before_id': meetings_list[-1]['id']} if has_older else None
+    return render_template('index.html', meetings=meetings_list, older_page_args=older_page_args, is_first_page=not before_time)
 
 @app.route('/process_recorded_audio', methods=['POST'])
 def process_recorded_audio():
@@ -247,10 +372,10 @@ def process_recorded_audio():
     try:
         if not os.path.exists(app.config['UPLOAD_FOLDER']): os.makedirs(app.config['UPLOAD_FOLDER'])
         file.save(filepath); logger.info(f"Live recording '{actual_stored_filename}' saved to {filepath}")
-        result = process_audio_file(filepath, actual_stored_filename, user_meeting_title_record, original_uploaded_filename_for_default_title=actual_stored_filename) 
-        if result['status'] == 'success':
-            return jsonify({'status': 'success', 'meeting_id': result['meeting_id'], 'redirect_url': url_for('meeting_detail', meeting_id=result['meeting_id']), 'summary': result.get('summary', "N/A"), 'action_items': result.get('action_items', []), 'decisions': result.get('decisions', []), 'nlp_error': result.get('nlp_error', False), 'meeting_title': result.get('meeting_title', actual_stored_filename) })
-        else: return jsonify({'status': 'error', 'message': result.get('message'), 'meeting_id': result.get('meeting_id')}), 500
+        meeting_id, meeting_title = create_audio_meeting(filepath, actual_stored_filename, user_meeting_title_record, original_uploaded_filename_for_default_title=actual_stored_filename) 
+        submit_processing(meeting_id)
+        # Results are pushed over the events stream instead of holding this request open until processing ends.
+        return jsonify({'status': 'processing', 'meeting_id': meeting_id, 'meeting_title': meeting_title, 'redirect_url': url_for('meeting_detail', meeting_id=meeting_id), 'events_url': url_for('meeting_events', meeting_id=meeting_id)}), 202
     except Exception as e: logger.error(f"Crit err handling live rec '{actual_stored_filename}': {e}", exc_info=True); return jsonify({'status': 'error', 'message': f'Server error: {str(e)}'}), 500
 
 @app.route('/process_text_transcript', methods=['POST'])
@@ -259,20 +384,97 @@ def process_text_transcript():
     user_meeting_title = request.form.get('meeting_title_text', '').strip()
     transcript_text = request.form.get('transcript_text', '').strip()
     if not transcript_text: flash('Transcript text cannot be empty.', 'danger'); return redirect(url_for('index'))
-    result = process_text_input(transcript_text, user_meeting_title) 
-    if result['status'] == 'success':
-        display_title = result.get('meeting_title', "Text Meeting")
-        flash_msg = f'Meeting "{display_title}" (from text) processed.' + (" Issues with NLP." if result.get('nlp_error') else "")
-        flash(flash_msg, 'warning' if result.get('nlp_error') else 'success')
-        return redirect(url_for('meeting_detail', meeting_id=result['meeting_id']))
-    else: flash(f"Error processing text transcript: {result.get('message', 'Unknown error')}", 'danger'); return redirect(url_for('index'))
+    try:
+        meeting_id, display_title = create_text_meeting(transcript_text, user_meeting_title) 
+    except Exception as e:
+        logger.error(f"Error storing text transcript: {e}", exc_info=True)
+        flash(f"Error processing text transcript: {str(e)[:100]}", 'danger'); return redirect(url_for('index'))
+    submit_processing(meeting_id)
+    flash(f'Meeting "{display_title}" (from text) submitted. Processing has started; this page updates as it progresses.', 'info')
+    return redirect(url_for('meeting_detail', meeting_id=meeting_id))
+
+MEETING_ACTION_ITEMS_QUERY = """
+    SELECT ai.*, ai.meeting_id != ? AS repeated_from_earlier FROM action_items ai
+    WHERE ai.meeting_id = ? OR ai.id IN (SELECT action_item_id FROM action_item_occurrences WHERE meeting_id = ?)
+    ORDER BY ai.id
+    """
+
+def _meeting_action_items(cursor, meeting_id):
+    """A meeting's action items, including existing items it repeated (stored once, under the meeting that first raised them)."""
+    cursor.execute(MEETING_ACTION_ITEMS_QUERY, (meeting_id, meeting_id, meeting_id))
+    return [dict(r) for r in cursor.fetchall()]
+
+# --- Server-Sent Events progress stream ---
+SSE_POLL_INTERVAL_SECONDS = 0.5
+SSE_KEEPALIVE_SECONDS = 15
+SSE_MAX_STREAM_SECONDS = 3 * 60 * 60
+FINAL_PROCESSING_STATUSES = ('completed', 'error')
+
+def _sse_event(event, data):
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+@app.route('/meeting/<int:meeting_id>/events')
+def meeting_events(meeting_id):
+    """
+    Streams a meeting's processing progress as Server-Sent Events:
+    'status' ({status, percent}) on every processing_status / transcription percent change, 'summary' once the
+    summary exists, then 'complete' with the final results (or 'error' if the meeting disappears), after which
+    the stream ends. Progress is read from the meetings row, so it works whichever process does the processing.
+    """
+    redirect_url = url_for('meeting_detail', meeting_id=meeting_id)
+    def stream():
+        conn = get_db_connection(); cursor = conn.cursor()
+        last_state = None; last_version = None; summary_sent = False
+        started = last_write = time.monotonic()
+        try:
+            yield "retry: 3000\n\n"
+            while time.monotonic() - started < SSE_MAX_STREAM_SECONDS:
+                cursor.execute("SELECT processing_status, progress_percent, version, meeting_title FROM meetings WHERE id = ?", (meeting_id,))
+                row = cursor.fetchone(); conn.commit() # end the read transaction so the next poll sees new writes
+                if row is None:
+                    yield _sse_event('error', {'message': 'Meeting not found.'}); return
+                state = (row['processing_status'], row['progress_percent'])
+                if state != last_state:
+                    yield _sse_event('status', {'status': state[0], 'percent': state[1]}); last_state = state; last_write = time.monotonic()
+                if row['version'] != last_version:
+                    last_version = row['version']
+                    if not summary_sent or row['processing_status'] in FINAL_PROCESSING_STATUSES:
+                        cursor.execute("SELECT summary FROM meetings WHERE id = ?", (meeting_id,)); summary = cursor.fetchone()['summary']
+                        if summary and not summary_sent:
+                            yield _sse_event('summary', {'summary': summary}); summary_sent = True; last_write = time.monotonic()
+                        if row['processing_status'] in FINAL_PROCESSING_STATUSES:
+                            action_items = [{k: item[k] for k in ('task', 'owner', 'due_date', 'status')} for item in _meeting_action_items(cursor, meeting_id)]
+                            cursor.execute("SELECT id, decision_text, status, resolution_notes FROM decisions WHERE meeting_id = ?", (meeting_id,)); decisions = [dict(r) for r in cursor.fetchall()]
+                            yield _sse_event('complete', {'status': row['processing_status'], 'meeting_id': meeting_id, 'meeting_title': row['meeting_title'],
+                                                          'redirect_url': redirect_url, 'summary': summary, 'action_items': action_items, 'decisions': decisions,
+                                                          'nlp_error': row['processing_status'] == 'error'})
+                            return
+                if time.monotonic() - last_write >= SSE_KEEPALIVE_SECONDS:
+                    yield ": keepalive\n\n"; last_write = time.monotonic()
+                time.sleep(SSE_POLL_INTERVAL_SECONDS)
+        finally:
+            conn.close()
+    return Response(stream(), mimetype='text/event-stream', headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
 
 # ... (All other routes: /tracker, /decision_tracker, /api/meeting_details, /calendar, /meeting/<id>, toggles, delete, .ics - remain IDENTICAL to your provided version)
 @app.route('/tracker') 
 def action_tracker():
     db = get_db(); cursor = db.cursor()
-    query = "SELECT ai.id, ai.task, ai.owner, ai.due_date, ai.status, ai.meeting_id, COALESCE(m.meeting_title, m.filename) as meeting_filename, m.upload_time as meeting_upload_time FROM action_items ai JOIN meetings m ON ai.meeting_id = m.id ORDER BY DATETIME(m.upload_time) DESC, CASE ai.status WHEN 'pending' THEN 1 ELSE 2 END, ai.due_date ASC NULLS LAST;"
-    cursor.execute(query); items_raw = cursor.fetchall(); all_items = []
+    version, updated_at = get_data_version(cursor)
+    owner_id = request.args.get('owner_id', type=int)
+    return conditional_response(f"tracker-{owner_id or 'all'}-v{version}", updated_at, lambda: _render_action_tracker(cursor, owner_id))
+
+def _render_action_tracker(cursor, owner_id=None):
+    # One row per distinct item; repeats from later meetings are counted, not listed. Filtering by owner uses idx_action_items_owner_id.
+    query = f"""
+        SELECT ai.id, ai.task, COALESCE(o.name, ai.owner) AS owner, ai.owner_id, ai.due_date, ai.status, ai.meeting_id,
+               COALESCE(m.meeting_title, m.filename) as meeting_filename, m.upload_time as meeting_upload_time,
+               (SELECT COUNT(DISTINCT occ.meeting_id) FROM action_item_occurrences occ WHERE occ.action_item_id = ai.id AND occ.meeting_id != ai.meeting_id) AS repeat_count
+        FROM action_items ai JOIN meetings m ON ai.meeting_id = m.id LEFT JOIN owners o ON o.id = ai.owner_id
+        {"WHERE ai.owner_id = ?" if owner_id else ""}
+        ORDER BY DATETIME(m.upload_time) DESC, CASE ai.status WHEN 'pending' THEN 1 ELSE 2 END, ai.due_date_parsed ASC NULLS LAST, ai.due_date ASC NULLS LAST
+        """
+    cursor.execute(query, (owner_id,) if owner_id else ()); items_raw = cursor.fetchall(); all_items = []
     for r_raw in items_raw: 
         item = dict(r_raw); mt = item.get('meeting_upload_time')
         if not isinstance(mt,datetime) and mt is not None: 
@@ -284,11 +486,16 @@ def action_tracker():
             item['meeting_upload_time'] = pt
             if not pt and mt : logger.warning(f"Tracker: time parse fail: '{mt}' AI ID {item.get('id')}.")
         all_items.append(item)
-    return render_template('tracker.html', all_action_items=all_items)
+    owners = [dict(r) for r in cursor.execute("SELECT id, name FROM owners ORDER BY name COLLATE NOCASE").fetchall()]
+    return render_template('tracker.html', all_action_items=all_items, owners=owners, selected_owner_id=owner_id)
 
 @app.route('/decision_tracker')
 def decision_tracker():
     db = get_db(); cursor = db.cursor()
+    version, updated_at = get_data_version(cursor)
+    return conditional_response(f"decisions-v{version}", updated_at, lambda: _render_decision_tracker(cursor))
+
+def _render_decision_tracker(cursor):
     query = "SELECT d.id, d.decision_text, d.status, d.resolution_notes, d.meeting_id, COALESCE(m.meeting_title, m.filename) as meeting_filename, m.upload_time as meeting_upload_time FROM decisions d JOIN meetings m ON d.meeting_id = m.id ORDER BY DATETIME(m.upload_time) DESC, d.id DESC;"
     cursor.execute(query); items_raw = cursor.fetchall(); all_items = []
     for r_raw in items_raw:
@@ -307,46 +514,78 @@ def decision_tracker():
 @app.route('/api/meeting_details/<int:meeting_id>')
 def api_meeting_details(meeting_id):
     db = get_db(); cursor = db.cursor()
-    m_data = {}; cursor.execute("SELECT * FROM meetings WHERE id = ?", (meeting_id,)); m_raw = cursor.fetchone()
+    meeting_version = get_meeting_version(cursor, meeting_id)
+    if meeting_version is None: return jsonify({"error": "Meeting not found"}), 404
+    return conditional_response(f"meeting-details-{meeting_id}-v{meeting_version[0]}", meeting_version[1], lambda: _build_meeting_details(cursor, meeting_id))
+
+def _build_meeting_details(cursor, meeting_id):
+    m_data = {}; cursor.execute(f"SELECT {MEETING_COLUMNS} FROM meetings WHERE id = ?", (meeting_id,)); m_raw = cursor.fetchone()
     if not m_raw: return jsonify({"error": "Meeting not found"}), 404
     m = dict(m_raw)
-    for k in ['upload_time']: 
+    for k in ['upload_time', 'updated_at']: 
         val = m.get(k)
         if isinstance(val, datetime): m[k] = val.isoformat()
         elif val is not None: m[k] = str(val) 
     m_data['meeting'] = m
-    cursor.execute("SELECT * FROM action_items WHERE meeting_id = ?", (meeting_id,)); m_data['action_items'] = [dict(r) for r in cursor.fetchall()]
+    m_data['action_items'] = _meeting_action_items(cursor, meeting_id)
     cursor.execute("SELECT id, decision_text, status, resolution_notes FROM decisions WHERE meeting_id = ?", (meeting_id,)); m_data['decisions'] = [dict(r) for r in cursor.fetchall()]
     return jsonify(m_data)
 
+CALENDAR_MAX_RANGE_DAYS = 62
+
 @app.route('/calendar')
 def calendar_view():
+    # Meetings are fetched month by month from /api/calendar by the page's JS.
+    return render_template('calendar_view.html')
+
+@app.route('/api/calendar')
+def api_calendar():
+    today = datetime.now().date()
+    default_start = today.replace(day=1)
+    default_end = (default_start.replace(day=28) + timedelta(days=4)).replace(day=1)
+    try:
+        range_start = datetime.strptime(request.args['start'], '%Y-%m-%d').date() if request.args.get('start') else default_start
+        range_end = datetime.strptime(request.args['end'], '%Y-%m-%d').date() if request.args.get('end') else default_end
+    except ValueError:
+        return jsonify({"error": "start and end must be YYYY-MM-DD dates"}), 400
+    if range_end <= range_start or (range_end - range_start).days > CALENDAR_MAX_RANGE_DAYS:
+        return jsonify({"error": f"end must be after start and at most {CALENDAR_MAX_RANGE_DAYS} days later"}), 400
+
     db = get_db(); cursor = db.cursor()
-    cursor.execute("SELECT id, filename, upload_time, processing_status, meeting_title FROM meetings ORDER BY upload_time DESC")
-    meetings_raw = cursor.fetchall(); meetings_by_date = {}
-    for m_row in meetings_raw:
-        m = dict(m_row); event_primary_time = m.get('upload_time')
-        if not isinstance(event_primary_time, datetime) and event_primary_time is not None:
-            parsed_time=None
-            if isinstance(event_primary_time, str):
-                for fmt in ('%Y-%m-%d %H:%M:%S.%f', '%Y-%m-%d %H:%M:%S', '%Y-%m-%dT%H:%M:%S.%f', '%Y-%m-%dT%H:%M:%S'): 
-                    try: parsed_time = datetime.strptime(event_primary_time, fmt); break
-                    except ValueError: continue
-            event_primary_time = parsed_time
-        if isinstance(event_primary_time, datetime):
-            date_str = event_primary_time.strftime('%Y-%m-%d')
-            if date_str not in meetings_by_date: meetings_by_date[date_str] = []
-            display_title_for_calendar = m.get('meeting_title') or m.get('filename') or "Untitled Event" 
-            meeting_entry = {'id': m['id'], 'display_title': display_title_for_calendar, 'processing_status': m.get('processing_status'), 'event_time_iso': event_primary_time.isoformat() }
-            if m.get('upload_time') and isinstance(m['upload_time'], datetime): meeting_entry['upload_time_iso'] = m['upload_time'].isoformat()
-            meetings_by_date[date_str].append(meeting_entry)
-        else: logger.warning(f"Calendar: Meeting ID {m['id']} invalid event_time: {event_primary_time}")
-    return render_template('calendar_view.html', meetings_by_date_json=json.dumps(meetings_by_date))
+    start_str, end_str = range_start.isoformat(), range_end.isoformat()
+    version, updated_at = get_data_version(cursor)
+    return conditional_response(f"calendar-{start_str}-{end_str}-v{version}", updated_at, lambda: _build_calendar_range(cursor, range_start, range_end))
+
+def _build_calendar_range(cursor, range_start, range_end):
+    start_str, end_str = range_start.isoformat(), range_end.isoformat()
+    cursor.execute("""
+        SELECT id, filename, upload_time, scheduled_datetime, processing_status, meeting_title FROM meetings
+        WHERE (upload_time >= ? AND upload_time < ?) OR (scheduled_datetime >= ? AND scheduled_datetime < ?)
+        ORDER BY upload_time DESC, id DESC
+        """, (start_str, end_str, start_str, end_str))
+    meetings_by_date = {}
+    for m_row in cursor.fetchall():
+        m = dict(m_row); event_primary_time = m.get('scheduled_datetime') or m.get('upload_time')
+        if not isinstance(event_primary_time, datetime):
+            logger.warning(f"Calendar API: Meeting ID {m['id']} invalid event_time: {event_primary_time}"); continue
+        if not (range_start <= event_primary_time.date() < range_end): continue
+        date_str = event_primary_time.strftime('%Y-%m-%d')
+        meeting_entry = {'id': m['id'], 'display_title': m.get('meeting_title') or m.get('filename') or "Untitled Event",
+                         'processing_status': m.get('processing_status'), 'event_time_iso': event_primary_time.isoformat()}
+        if isinstance(m.get('upload_time'), datetime): meeting_entry['upload_time_iso'] = m['upload_time'].isoformat()
+        meetings_by_date.setdefault(date_str, []).append(meeting_entry)
+
+    return jsonify({'start': start_str, 'end': end_str, 'meetings_by_date': meetings_by_date})
 
 @app.route('/meeting/<int:meeting_id>')
 def meeting_detail(meeting_id):
     db = get_db(); cursor = db.cursor()
-    cursor.execute("SELECT * FROM meetings WHERE id = ?", (meeting_id,))
+    meeting_version = get_meeting_version(cursor, meeting_id)
+    if meeting_version is None: flash('Meeting not found.', 'danger'); return redirect(url_for('index'))
+    return conditional_response(f"meeting-{meeting_id}-v{meeting_version[0]}", meeting_version[1], lambda: _render_meeting_detail(cursor, meeting_id))
+
+def _render_meeting_detail(cursor, meeting_id):
+    cursor.execute(f"SELECT {MEETING_COLUMNS} FROM meetings WHERE id = ?", (meeting_id,))
     m_raw = cursor.fetchone()
     if not m_raw: flash('Meeting not found.', 'danger'); return redirect(url_for('index'))
     m = dict(m_raw); k = 'upload_time'; val = m.get(k)
@@ -358,7 +597,8 @@ def meeting_detail(meeting_id):
                 except ValueError: continue
         m[k] = pt
         if not pt and val: logger.warning(f"Detail: Could not parse {k}: '{val}' ID {m.get('id')}.")
-    action_items = [dict(r) for r in cursor.execute("SELECT * FROM action_items WHERE meeting_id = ?", (meeting_id,)).fetchall()]
+    m['transcript'] = load_transcript(cursor, meeting_id) # only the detail page needs the (large) transcript
+    action_items = _meeting_action_items(cursor, meeting_id)
     decisions = [dict(r) for r in cursor.execute("SELECT id, decision_text, status, resolution_notes FROM decisions WHERE meeting_id = ?", (meeting_id,)).fetchall()]
     return render_template('meeting_detail.html', meeting=m, action_items=action_items, decisions=decisions)
 
@@ -366,7 +606,7 @@ def meeting_detail(meeting_id):
 def toggle_action_item_status(item_id):
     db=get_db();cur=db.cursor();cur.execute("SELECT status,meeting_id FROM action_items WHERE id=?",(item_id,));item=cur.fetchone()
     if not item:flash('Action item not found.','danger');return redirect(request.referrer or url_for('index'))
-    new_s='completed' if item['status']=='pending' else 'pending';cur.execute("UPDATE action_items SET status=? WHERE id=?",(new_s,item_id));db.commit()
+    new_s='completed' if item['status']=='pending' else 'pending';cur.execute("UPDATE action_items SET status=? WHERE id=?",(new_s,item_id));bump_action_item_meetings(cur,item_id);db.commit()
     flash(f'Action Item status updated to {new_s}.','success');next_url=request.args.get('next');return redirect(next_url or url_for('meeting_detail',meeting_id=item['meeting_id']))
 
 @app.route('/decision/<int:decision_id>/toggle_status', methods=['POST'])
@@ -379,10 +619,12 @@ def toggle_decision_status(decision_id):
         cur.execute("SELECT status FROM decisions WHERE id=?",(decision_id,));curr_d=cur.fetchone()
         if not curr_d: flash('Decision not found.', 'danger'); return redirect(request.referrer or url_for('decision_tracker'))
         new_s='implemented' if curr_d['status']=='open' else 'open'
-    cur.execute("UPDATE decisions SET status=? WHERE id=?",(new_s,decision_id));db.commit();flash(f'Decision status updated to {new_s}.','success')
+    cur.execute("SELECT meeting_id FROM decisions WHERE id=?",(decision_id,));d_info=cur.fetchone()
+    cur.execute("UPDATE decisions SET status=? WHERE id=?",(new_s,decision_id))
+    if d_info: bump_meeting_version(cur,d_info['meeting_id'])
+    db.commit();flash(f'Decision status updated to {new_s}.','success')
     next_url=request.args.get('next');
     if next_url:return redirect(next_url)
-    cur.execute("SELECT meeting_id FROM decisions WHERE id=?",(decision_id,));d_info=cur.fetchone()
     return redirect(url_for('meeting_detail',meeting_id=d_info['meeting_id']) if d_info else url_for('decision_tracker'))
 
 @app.route('/meeting/<int:meeting_id>/delete', methods=['POST'])
@@ -391,9 +633,10 @@ def delete_meeting(meeting_id):
     if not m_rec:flash('Meeting not found.','danger');return redirect(url_for('index'))
     disk_filename=m_rec['filename'];display_title=m_rec['meeting_title'] or disk_filename
     try:
-        cur.execute("DELETE FROM action_items WHERE meeting_id = ?", (meeting_id,)) 
+        for other_meeting_id in delete_meeting_action_items(cur, meeting_id): bump_meeting_version(cur, other_meeting_id)
         cur.execute("DELETE FROM decisions WHERE meeting_id = ?", (meeting_id,))  
-        cur.execute("DELETE FROM meetings WHERE id=?",(meeting_id,));db.commit();logger.info(f"Deleted meeting ID {meeting_id} data.")
+        cur.execute("DELETE FROM meeting_content WHERE meeting_id = ?", (meeting_id,))
+        cur.execute("DELETE FROM meetings WHERE id=?",(meeting_id,));bump_data_version(cur);db.commit();logger.info(f"Deleted meeting ID {meeting_id} data.")
         if disk_filename : 
             f_path=os.path.join(app.config['UPLOAD_FOLDER'],disk_filename)
             if os.path.exists(f_path):os.remove(f_path);logger.info(f"Deleted file: {f_path}")
@@ -403,30 +646,79 @@ def delete_meeting(meeting_id):
     except Exception as e:db.rollback();logger.error(f"Error deleting meeting {meeting_id}:{e}",exc_info=True);flash(f'Error deleting: {str(e)}','danger')
     return redirect(url_for('index'))
 
+PENDING_ACTION_ITEMS_QUERY = """
+    SELECT ai.id, ai.task, ai.owner, ai.due_date, ai.due_date_parsed, ai.meeting_id,
+           COALESCE(m.meeting_title, m.filename) AS meeting_title, m.scheduled_datetime, m.upload_time
+    FROM action_items ai JOIN meetings m ON ai.meeting_id = m.id
+    WHERE ai.status = 'pending' {meeting_filter}
+    ORDER BY ai.due_date_parsed IS NULL, ai.due_date_parsed, ai.id
+    """
+
+def _render_pending_actions_ics(cursor, dtstamp, calendar_name, meeting_id=None):
+    """Builds the iCalendar body for pending action items (of one meeting, or all). Returns None if there are none."""
+    if meeting_id is None: cursor.execute(PENDING_ACTION_ITEMS_QUERY.format(meeting_filter=""))
+    else: cursor.execute(PENDING_ACTION_ITEMS_QUERY.format(meeting_filter="AND (ai.meeting_id = ? OR ai.id IN (SELECT action_item_id FROM action_item_occurrences WHERE meeting_id = ?))"), (meeting_id, meeting_id))
+    items = [dict(row, meeting_time=row['scheduled_datetime'] or row['upload_time']) for row in cursor.fetchall()]
+    if not items and meeting_id is not None: return None
+    logger.info(f"Rendering ICS '{calendar_name}' with {len(items)} pending action items.")
+    return render_action_items_calendar(items, dtstamp or datetime.now(timezone.utc).replace(tzinfo=None), calendar_name,
+                                        meeting_url_for=lambda m_id: url_for('meeting_detail', meeting_id=m_id, _external=True))
+
+@app.route('/calendar/action_items.ics')
+def action_items_feed():
+    """Subscribable feed of every pending action item. Unchanged data is answered with 304 or from the response cache."""
+    db = get_db(); cursor = db.cursor()
+    version, updated_at = get_data_version(cursor)
+    return conditional_response(f"actions-ics-v{version}", updated_at,
+                                lambda: Response(_render_pending_actions_ics(cursor, updated_at, "Meeting Action Items"), mimetype='text/calendar'))
+
 @app.route('/meeting/<int:meeting_id>/calendar') 
 def download_calendar_file(meeting_id):
     db=get_db();cur=db.cursor()
-    cur.execute("SELECT filename FROM meetings WHERE id=?",(meeting_id,))
-    if not cur.fetchone():flash('Meeting not found for .ics export.','danger');return redirect(url_for('index'))
-    cur.execute("SELECT ai.task,ai.owner,ai.due_date FROM action_items ai JOIN meetings m ON ai.meeting_id=m.id WHERE ai.meeting_id=? AND ai.status='pending'",(meeting_id,));items_raw=cur.fetchall()
-    if not items_raw:flash('No actionable items for this processed meeting to export.','info');return redirect(url_for('meeting_detail',meeting_id=meeting_id))
-    cal=Calendar()
-    for item_row_cal in items_raw:
-        item_cal=dict(item_row_cal);event=Event();event.name=f"Action: {item_cal['task']}";description=f"Task: {item_cal['task']}"+(f"\nOwner: {item_cal['owner']}" if item_cal['owner'] else "");event.description=description
-        parsed_due_date = dateparser.parse(item_cal['due_date'], settings={'PREFER_DATES_FROM': 'future', 'RETURN_AS_TIMEZONE_AWARE': False}) if item_cal['due_date'] else None
-        event.begin = parsed_due_date if parsed_due_date else datetime.now().date();event.make_all_day()
-        if not parsed_due_date and item_cal['due_date']: event.description += f"\nOriginal Due Date (unparsed): {item_cal['due_date']}"
-        cal.events.add(event)
-    ics_filename = f"meeting_{meeting_id}_actions.ics"; ics_filepath = os.path.join(app.config['UPLOAD_FOLDER'], ics_filename)
+    meeting_version = get_meeting_version(cur, meeting_id)
+    if meeting_version is None:flash('Meeting not found for .ics export.','danger');return redirect(url_for('index'))
+    def render():
+        body = _render_pending_actions_ics(cur, meeting_version[1], f"Meeting {meeting_id} Action Items", meeting_id=meeting_id)
+        if body is None:flash('No actionable items for this processed meeting to export.','info');return redirect(url_for('meeting_detail',meeting_id=meeting_id))
+        return Response(body, mimetype='text/calendar')
+    response = conditional_response(f"meeting-ics-{meeting_id}-v{meeting_version[0]}", meeting_version[1], render)
+    if response.status_code in (200, 304): response.headers['Content-Disposition'] = f'attachment; filename="meeting_{meeting_id}_actions.ics"'
+    return response
+
+@app.route('/healthz')
+def healthz():
+    """Liveness: the process is up and serving requests. Deliberately touches nothing else."""
+    return jsonify({'status': 'ok'})
+
+PROCESSING_WORKER_STALE_SECONDS = 30
+
+@app.route('/readyz')
+def readyz():
+    """
+    Readiness: the database answers. Also reports the processing backlog and, with external processing,
+    how many worker processes have sent a heartbeat recently. Those are informational and do not fail the
+    check, since dashboards keep working while uploads wait in the queue.
+    """
+    body = {'processing_mode': PROCESSING_MODE}
     try:
-        with open(ics_filepath, 'w', encoding='utf-8') as f: f.writelines(cal.serialize_iter())
-        logger.info(f"Generated ICS: {ics_filepath} for meeting ID {meeting_id}, {len(cal.events)} events.")
-        return send_file(ics_filepath, as_attachment=True, download_name=ics_filename, mimetype='text/calendar')
-    except Exception as e: logger.error(f"Error generating/sending ICS for meeting ID {meeting_id}: {e}", exc_info=True);flash("Error generating calendar file.", "danger");return redirect(url_for('meeting_detail',meeting_id=meeting_id))
-    finally:
-        if os.path.exists(ics_filepath):
-            try: os.remove(ics_filepath); logger.debug(f"Removed temp ICS: {ics_filepath}")
-            except Exception as e_rem: logger.error(f"Error removing temp ICS {ics_filepath}: {e_rem}")
+        cursor = get_db().cursor()
+        cursor.execute("SELECT COUNT(*) AS n FROM meetings WHERE processing_status = 'queued'"); body['queued_meetings'] = cursor.fetchone()['n']
+        if PROCESSING_MODE == 'external': body['processing_workers'] = count_live_processing_workers(cursor, PROCESSING_WORKER_STALE_SECONDS)
+        body['database'] = 'ok'
+    except sqlite3.Error as e:
+        logger.error(f"Readiness check failed: {e}")
+        body['database'] = f'error: {e}'
+        return jsonify(dict(body, status='unavailable')), 503
+    return jsonify(dict(body, status='ready'))
+
+@app.route('/metrics')
+def metrics_endpoint():
+    db = get_db(); cursor = db.cursor()
+    cursor.execute("SELECT processing_status, COUNT(*) AS n FROM meetings GROUP BY processing_status")
+    status_counts = {row['processing_status']: row['n'] for row in cursor.fetchall()}
+    if PROCESSING_MODE == 'external': # the work happens in worker processes; the queue lives in the database
+        PROCESSING_QUEUE_DEPTH.set(sum(n for status, n in status_counts.items() if status == 'queued' or status in IN_PROGRESS_STATUSES))
+    return Response(render_metrics(status_counts), mimetype='text/plain; version=0.0.4')
 
 if __name__ == '__main__':
     if not os.path.exists(UPLOAD_FOLDER): os.makedirs(UPLOAD_FOLDER)
@@ -0,0 +1,98 @@
+# benchmarks/bench_storage.py
+"""
+Before/after benchmark for moving transcripts out of the meetings table.
+
+Builds a dataset in the legacy layout (transcripts inline in meetings.transcript), measures it, lets
+database.init_db() migrate it to meeting_content, and measures again:
+
+    python -m benchmarks.bench_storage --meetings 5000
+
+Reported per layout: DB file size, and for each hot query its wall time and bytes read from the DB file
+(from /proc/self/io on Linux, with a cold page cache per query; null elsewhere).
+"""
+import os
+import sys
+import json
+import time
+import shutil
+import logging
+import argparse
+import tempfile
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path: sys.path.insert(0, PROJECT_ROOT)
+
+import database
+from benchmarks import fixtures
+
+logger = logging.getLogger(__name__)
+
+HOT_QUERIES = {
+    'home_list': ("SELECT id, filename, upload_time, processing_status, summary_preview, meeting_title FROM meetings "
+                  "ORDER BY upload_time DESC, id DESC", ()),
+    'status_scan': ("SELECT processing_status, COUNT(*) FROM meetings GROUP BY processing_status", ()),
+    'tracker_join': ("SELECT ai.id, ai.task, COALESCE(m.meeting_title, m.filename) FROM action_items ai JOIN meetings m ON ai.meeting_id = m.id", ()),
+    'meeting_row_by_id': ("SELECT * FROM meetings WHERE id = ?", (1,)),
+}
+
+
+def _bytes_read():
+    """Bytes this process has read via read()/pread() so far, or None where /proc/self/io is unavailable."""
+    try:
+        with open('/proc/self/io') as f:
+            return next(int(line.split()[1]) for line in f if line.startswith('rchar:'))
+    except (OSError, StopIteration):
+        return None
+
+
+def measure_layout(db_path, repeats):
+    results = {'db_bytes': os.path.getsize(db_path), 'queries': {}}
+    for name, (sql, params) in HOT_QUERIES.items():
+        times, reads = [], []
+        for _ in range(repeats):
+            conn = database.get_db_connection() # fresh connection, so SQLite's page cache starts cold
+            before_io = _bytes_read(); start = time.perf_counter()
+            conn.execute(sql, params).fetchall()
+            times.append(time.perf_counter() - start); after_io = _bytes_read()
+            if before_io is not None and after_io is not None: reads.append(after_io - before_io)
+            conn.close()
+        results['queries'][name] = {'mean_ms': round(sum(times) / len(times) * 1000, 3),
+                                    'bytes_read': round(sum(reads) / len(reads)) if reads else None}
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare inline vs split transcript storage.")
+    parser.add_argument('--meetings', type=int, default=5000)
+    parser.add_argument('--repeats', type=int, default=5)
+    parser.add_argument('--output', help="Optional path for the JSON results.")
+    args = parser.parse_args(argv)
+    if not logging.getLogger().hasHandlers():
+        logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+    work_dir = tempfile.mkdtemp(prefix='meeting_storage_bench_')
+    previous_db = database.DATABASE_NAME
+    try:
+        db_path = os.path.join(work_dir, 'storage.db')
+        fixtures.generate_dataset(db_path, args.meetings, inline_transcripts=True)
+        database.DATABASE_NAME = db_path
+        results = {'meetings': args.meetings, 'before': measure_layout(db_path, args.repeats)}
+        start = time.perf_counter(); database.init_db() # migrates inline transcripts and vacuums
+        results['migration_seconds'] = round(time.perf_counter() - start, 3)
+        results['after'] = measure_layout(db_path, args.repeats)
+    finally:
+        database.DATABASE_NAME = previous_db
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    print(f"DB size: {results['before']['db_bytes'] / 1e6:.1f} MB -> {results['after']['db_bytes'] / 1e6:.1f} MB "
+          f"(migration {results['migration_seconds']:.1f}s)")
+    for name in HOT_QUERIES:
+        b, a = results['before']['queries'][name], results['after']['queries'][name]
+        print(f"{name:<20} {b['mean_ms']:>10.2f} ms -> {a['mean_ms']:>8.2f} ms   read {b['bytes_read']} -> {a['bytes_read']} bytes")
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f: json.dump(results, f, indent=2)
+    return results
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,114 @@
+# benchmarks/fixtures.py
+import os
+import wave
+import random
+import logging
+import datetime
+
+import numpy as np
+
+import dedup
+import database
+
+logger = logging.getLogger(__name__)
+
+SAMPLE_RATE = 16000 # Whisper's native rate, so ffmpeg only has to decode, not resample.
+
+_WORDS = ("quarterly report budget roadmap customer release sprint migration vendor contract hiring onboarding "
+          "latency dashboard pipeline review feedback launch pricing forecast backlog incident retro metrics "
+          "design proposal security audit timeline deliverable stakeholder").split()
+_NAMES = ["Alice", "Bob", "Charlie", "Dana", "Evan", "Farah", "Grace", "Hiro"]
+_DUE_DATES = ["Next Friday", "In two weeks", "End of month", "Tomorrow", "2024-07-01", None, "N/A"]
+
+
+def generate_synthetic_audio(path, duration_seconds, seed=0):
+    """
+    Writes a 16 kHz mono 16-bit WAV with speech-like bursts (voiced harmonics gated at syllable rate, with pauses).
+
+    It is not intelligible speech; it only gives Whisper realistic amounts of non-silent audio so that
+    transcription time scales with duration the way it does for real meetings.
+    """
+    rng = np.random.default_rng(seed)
+    n = int(duration_seconds * SAMPLE_RATE)
+    t = np.arange(n) / SAMPLE_RATE
+    pitch = 120 + 40 * np.sin(2 * np.pi * 0.3 * t) # slowly drifting fundamental
+    phase = 2 * np.pi * np.cumsum(pitch) / SAMPLE_RATE
+    voiced = sum(np.sin(k * phase) / k for k in range(1, 6))
+    syllables = (np.sin(2 * np.pi * 4.0 * t) > 0).astype(np.float32) # ~4 syllables/s
+    pauses = np.repeat(rng.random(int(duration_seconds) + 1) > 0.2, SAMPLE_RATE)[:n] # ~20% of seconds silent
+    signal = voiced * syllables * pauses + 0.02 * rng.standard_normal(n)
+    pcm = np.int16(np.clip(signal / (np.max(np.abs(signal)) or 1), -1, 1) * 0.6 * 32767)
+    with wave.open(path, 'wb') as wav:
+        wav.setnchannels(1); wav.setsampwidth(2); wav.setframerate(SAMPLE_RATE)
+        wav.writeframes(pcm.tobytes())
+    return path
+
+
+def generate_transcript(word_count, seed=0):
+    """Returns a speaker-labelled synthetic transcript of roughly word_count words."""
+    rng = random.Random(seed)
+    lines = []; words_written = 0
+    while words_written < word_count:
+        sentence = " ".join(rng.choice(_WORDS) for _ in range(rng.randint(6, 18)))
+        lines.append(f"{rng.choice(_NAMES)}: {sentence.capitalize()}.")
+        words_written += len(sentence.split())
+    return "\n".join(lines)
+
+
+def _sentence(seed):
+    """A single synthetic sentence without the speaker label."""
+    return generate_transcript(1, seed=seed).split(': ', 1)[1]
+
+
+def generate_dataset(db_path, meeting_count, seed=0, inline_transcripts=False):
+    """
+    Builds a SQLite database with the app's schema and meeting_count synthetic meetings spread over ~3 years,
+    each with a transcript, summary, action items and decisions.
+
+    With inline_transcripts=True transcripts are written to the legacy meetings.transcript column instead of
+    meeting_content, reproducing the pre-split layout (the next init_db() migrates it).
+
+    Returns:
+        list: The ids of the generated meetings.
+    """
+    if os.path.exists(db_path): os.remove(db_path)
+    previous_db = database.DATABASE_NAME
+    database.DATABASE_NAME = db_path
+    try:
+        database.init_db()
+        conn = database.get_db_connection(); cursor = conn.cursor()
+        rng = random.Random(seed)
+        start = datetime.datetime.now() - datetime.timedelta(days=3 * 365)
+        step = datetime.timedelta(days=3 * 365) / max(meeting_count, 1)
+        meeting_ids = []; due_dates_parsed = {} # (text, day) -> date; dateparser is the slow part of generation
+        def parse_due(text, base):
+            key = (text, base.date())
+            if key not in due_dates_parsed: due_dates_parsed[key] = database.parse_due_date(text, base)
+            return due_dates_parsed[key]
+        for i in range(meeting_count):
+            upload_time = start + step * i + datetime.timedelta(minutes=rng.randint(0, 60))
+            status = 'completed' if rng.random() > 0.05 else 'error'
+            transcript = generate_transcript(rng.randint(300, 3000), seed=seed + i)
+            summary = "\n".join(f"- {_sentence(seed + i * 7 + k)}" for k in range(rng.randint(4, 8)))
+            cursor.execute("""
+                INSERT INTO meetings (filename, upload_time, transcript, summary, summary_preview, processing_status, meeting_title)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                """, (f"bench_{i}.wav", upload_time, transcript if inline_transcripts else None, summary,
+                      database.make_summary_preview(summary), status, f"Benchmark Meeting {i}"))
+            meeting_id = cursor.lastrowid; meeting_ids.append(meeting_id)
+            if not inline_transcripts: database.save_transcript(cursor, meeting_id, transcript)
+            action_items = [(meeting_id, _sentence(seed + i * 13 + k), rng.choice(_NAMES + [None]), rng.choice(_DUE_DATES),
+                             rng.choice(['pending', 'completed'])) for k in range(rng.randint(0, 6))]
+            for item in action_items: # random sentences never repeat, so items are inserted directly rather than via store_action_item
+                cursor.execute("INSERT INTO action_items (meeting_id, task, owner, due_date, status, due_date_parsed, owner_id) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                               item + (parse_due(item[3], upload_time), database.get_or_create_owner(cursor, item[2])))
+                dedup.index_action_item(cursor, cursor.lastrowid, dedup.minhash_signature(item[1]))
+            cursor.executemany("INSERT INTO decisions (meeting_id, decision_text, status) VALUES (?, ?, ?)",
+                               [(meeting_id, _sentence(seed + i * 17 + k), rng.choice(['open', 'implemented']))
+                                for k in range(rng.randint(0, 4))])
+            if i % 1000 == 999: conn.commit()
+        conn.commit(); conn.close()
+        logger.info(f"Generated benchmark dataset at {db_path} with {meeting_count} meetings ({os.path.getsize(db_path) / 1e6:.1f} MB).")
+        return meeting_ids
+    finally:
+        database.DATABASE_NAME = previous_db
@@ -0,0 +1,234 @@
+# benchmarks/load_test.py
+"""
+Load test for the production launcher: dashboard throughput and latency while transcriptions are running.
+
+By default it generates a dataset in a temporary directory, starts the stub LLM server and runs
+`python serve.py` against them, then measures two phases with concurrent HTTP clients:
+
+    idle        dashboard requests only
+    processing  the same load while --uploads synthetic recordings are uploaded and processed
+
+    python -m benchmarks.load_test                          # results in benchmarks/results/
+    python -m benchmarks.load_test --web-workers 4 --processing-workers 2 --clients 32
+    python -m benchmarks.load_test --url http://127.0.0.1:5001   # against an already running server
+
+Transcription uses the real Whisper model in the processing workers (downloaded on first use).
+
+With --cache cold (default) the server is started with its response cache disabled (RESPONSE_CACHE_MAX_BYTES=0),
+so each request runs its queries and render; --cache warm keeps the cache and mostly measures cache hits.
+With --url the server's own cache setting applies.
+"""
+import os
+import sys
+import json
+import time
+import uuid
+import random
+import shutil
+import signal
+import socket
+import logging
+import argparse
+import datetime
+import tempfile
+import threading
+import subprocess
+import urllib.error
+import urllib.request
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path: sys.path.insert(0, PROJECT_ROOT)
+
+from benchmarks.stub_llm_server import start_stub_llm_server
+from benchmarks.run_benchmarks import RESULTS_DIR, percentile
+from benchmarks import fixtures
+
+logger = logging.getLogger(__name__)
+
+DASHBOARD_ROUTES = ['/', '/tracker', '/decision_tracker', '/api/calendar', '/meeting/<id>']
+TERMINAL_STATUSES = ('completed', 'error')
+
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0)); return s.getsockname()[1]
+
+
+def _get(url, timeout=30):
+    with urllib.request.urlopen(url, timeout=timeout) as response:
+        return response.status, response.read()
+
+
+def wait_until_ready(base_url, timeout):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if _get(base_url + '/readyz', timeout=2)[0] == 200: return
+        except (urllib.error.URLError, OSError):
+            pass
+        time.sleep(0.5)
+    raise RuntimeError(f"{base_url} did not become ready within {timeout}s")
+
+
+def run_dashboard_load(base_url, meeting_ids, clients, duration, seed=0, cache='cold'):
+    """GETs random dashboard routes from `clients` threads for `duration` seconds; returns latency stats."""
+    samples = []; errors = []; lock = threading.Lock()
+    deadline = time.monotonic() + duration
+
+    def client(n):
+        rng = random.Random(seed * 1000 + n)
+        while time.monotonic() < deadline:
+            route = rng.choice(DASHBOARD_ROUTES)
+            url = base_url + (route.replace('<id>', str(rng.choice(meeting_ids))) if '<id>' in route else route)
+            start = time.perf_counter()
+            try:
+                _get(url); elapsed = time.perf_counter() - start
+                with lock: samples.append(elapsed)
+            except (urllib.error.URLError, OSError) as e:
+                with lock: errors.append(f"GET {url}: {e}")
+
+    started = time.perf_counter()
+    threads = [threading.Thread(target=client, args=(n,), daemon=True) for n in range(clients)]
+    for t in threads: t.start()
+    for t in threads: t.join()
+    wall = time.perf_counter() - started
+    ms = [s * 1000 for s in samples]
+    stats = {'cache': cache, 'clients': clients, 'seconds': round(wall, 3), 'requests': len(ms), 'errors': len(errors),
+             'rps': round(len(ms) / wall, 1) if wall else 0.0}
+    if ms: stats.update({'p50_ms': round(percentile(ms, 50), 3), 'p99_ms': round(percentile(ms, 99), 3), 'max_ms': round(max(ms), 3)})
+    for error in errors[:5]: logger.warning(error)
+    return stats
+
+
+def upload_recording(base_url, path, title):
+    """POSTs an audio file the way the recorder does; returns the new meeting id."""
+    boundary = uuid.uuid4().hex
+    with open(path, 'rb') as f: audio = f.read()
+    body = (f"--{boundary}\r\nContent-Disposition: form-data; name=\"meeting_title_record\"\r\n\r\n{title}\r\n"
+            f"--{boundary}\r\nContent-Disposition: form-data; name=\"audio_file\"; filename=\"{os.path.basename(path)}\"\r\n"
+            f"Content-Type: audio/wav\r\n\r\n").encode('utf-8') + audio + f"\r\n--{boundary}--\r\n".encode('utf-8')
+    request = urllib.request.Request(base_url + '/process_recorded_audio', data=body, method='POST',
+                                     headers={'Content-Type': f"multipart/form-data; boundary={boundary}"})
+    with urllib.request.urlopen(request, timeout=60) as response:
+        return json.loads(response.read())['meeting_id']
+
+
+def meeting_statuses(base_url, meeting_ids):
+    statuses = {}
+    for meeting_id in meeting_ids:
+        try: statuses[meeting_id] = json.loads(_get(f"{base_url}/api/meeting_details/{meeting_id}")[1])['meeting']['processing_status']
+        except (urllib.error.URLError, OSError, ValueError, KeyError): statuses[meeting_id] = None
+    return statuses
+
+
+def run_processing_phase(base_url, work_dir, meeting_ids, args):
+    """Uploads synthetic recordings, then keeps the dashboard load running until they finish (or --processing-timeout)."""
+    uploaded = []
+    for i in range(args.uploads):
+        path = fixtures.generate_synthetic_audio(os.path.join(work_dir, f"load_test_{i}.wav"), args.audio_seconds, seed=i)
+        uploaded.append(upload_recording(base_url, path, f"Load test recording {i + 1}"))
+    logger.info(f"Uploaded {len(uploaded)} recordings of {args.audio_seconds}s: meetings {uploaded}.")
+
+    rounds = []; started = time.monotonic(); statuses = {}
+    while True:
+        rounds.append(run_dashboard_load(base_url, meeting_ids, args.clients, args.duration, seed=len(rounds) + 1, cache=args.cache))
+        statuses = meeting_statuses(base_url, uploaded)
+        done = sum(1 for s in statuses.values() if s in TERMINAL_STATUSES)
+        logger.info(f"Processing phase: {rounds[-1]['rps']} req/s, p99 {rounds[-1].get('p99_ms')} ms; {done}/{len(uploaded)} meetings finished.")
+        if done == len(uploaded) or time.monotonic() - started > args.processing_timeout: break
+
+    requests_total = sum(r['requests'] for r in rounds); seconds_total = sum(r['seconds'] for r in rounds)
+    return {'cache': args.cache, 'uploads': len(uploaded), 'audio_seconds': args.audio_seconds, 'wall_seconds': round(time.monotonic() - started, 3),
+            'meetings_completed': sum(1 for s in statuses.values() if s == 'completed'),
+            'meetings_failed': sum(1 for s in statuses.values() if s == 'error'),
+            'requests': requests_total, 'errors': sum(r['errors'] for r in rounds),
+            'rps': round(requests_total / seconds_total, 1) if seconds_total else 0.0,
+            'p50_ms': max((r.get('p50_ms', 0) for r in rounds), default=None), # worst round, per phase
+            'p99_ms': max((r.get('p99_ms', 0) for r in rounds), default=None), 'rounds': rounds}
+
+
+def start_server(work_dir, args, llm_base_url):
+    port = _free_port()
+    env = dict(os.environ, OPENAI_API_KEY='load-test-stub-key', OPENAI_BASE_URL=llm_base_url,
+               PYTHONPATH=os.pathsep.join(filter(None, [PROJECT_ROOT, os.environ.get('PYTHONPATH')])))
+    if args.cache == 'cold': env['RESPONSE_CACHE_MAX_BYTES'] = '0'
+    command = [sys.executable, os.path.join(PROJECT_ROOT, 'serve.py'), '--bind', f"127.0.0.1:{port}",
+               '--web-workers', str(args.web_workers), '--web-threads', str(args.web_threads),
+               '--processing-workers', str(args.processing_workers), '--graceful-timeout', str(args.server_graceful_timeout),
+               '--shutdown-timeout', str(args.server_shutdown_timeout)]
+    log = open(os.path.join(work_dir, 'server.log'), 'wb')
+    # cwd=work_dir: the app keeps meetings.db and uploads/ relative to its working directory.
+    process = subprocess.Popen(command, cwd=work_dir, env=env, stdout=log, stderr=subprocess.STDOUT)
+    return process, log, f"http://127.0.0.1:{port}"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure dashboard throughput of serve.py while meetings are being processed.")
+    parser.add_argument('--url', help="Load-test an already running server instead of starting one (no dataset is generated).")
+    parser.add_argument('--meetings', type=int, default=2000, help="Meetings in the generated dataset.")
+    parser.add_argument('--meeting-ids', type=int, nargs='+', help="With --url: meeting ids to request (default: 1..100).")
+    parser.add_argument('--clients', type=int, default=16, help="Concurrent dashboard clients.")
+    parser.add_argument('--cache', choices=['cold', 'warm'], default='cold',
+                        help="cold: start the server with its response cache disabled so requests render; warm: keep it (mostly cache hits).")
+    parser.add_argument('--duration', type=float, default=15.0, help="Seconds per load round.")
+    parser.add_argument('--uploads', type=int, default=2, help="Recordings uploaded in the processing phase.")
+    parser.add_argument('--audio-seconds', type=int, default=60, help="Length of each synthetic recording.")
+    parser.add_argument('--processing-timeout', type=float, default=600.0, help="Give up waiting for uploads after this many seconds.")
+    parser.add_argument('--web-workers', type=int, default=4)
+    parser.add_argument('--web-threads', type=int, default=8)
+    parser.add_argument('--processing-workers', type=int, default=1)
+    parser.add_argument('--server-graceful-timeout', type=int, default=10, help="Passed to serve.py --graceful-timeout.")
+    parser.add_argument('--server-shutdown-timeout', type=int, default=30,
+                        help="Passed to serve.py --shutdown-timeout: how long meetings still processing at the end may run on.")
+    parser.add_argument('--llm-latency-ms', type=float, default=50.0, help="Artificial latency of the stub LLM server.")
+    parser.add_argument('--startup-timeout', type=float, default=300.0, help="Seconds to wait for /readyz (includes loading Whisper).")
+    parser.add_argument('--output', help="Result file path (default: benchmarks/results/load_<timestamp>.json).")
+    args = parser.parse_args(argv)
+    if not logging.getLogger().hasHandlers():
+        logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+    work_dir = tempfile.mkdtemp(prefix='meeting_load_test_')
+    llm_server = process = log = None
+    results = {'timestamp': datetime.datetime.now().isoformat(timespec='seconds'), 'cpu_count': os.cpu_count(),
+               'config': {k: v for k, v in vars(args).items() if k != 'output'}}
+    try:
+        if args.url:
+            base_url = args.url.rstrip('/'); meeting_ids = args.meeting_ids or list(range(1, 101))
+            args.cache = 'server' # recorded as such: the running server's RESPONSE_CACHE_MAX_BYTES decides
+        else:
+            meeting_ids = fixtures.generate_dataset(os.path.join(work_dir, 'meetings.db'), args.meetings)
+            llm_server, llm_base_url = start_stub_llm_server(latency_seconds=args.llm_latency_ms / 1000.0)
+            process, log, base_url = start_server(work_dir, args, llm_base_url)
+        wait_until_ready(base_url, args.startup_timeout)
+        results['readyz'] = json.loads(_get(base_url + '/readyz')[1])
+
+        results['idle'] = run_dashboard_load(base_url, meeting_ids, args.clients, args.duration, cache=args.cache)
+        logger.info(f"Idle phase: {results['idle']['rps']} req/s, p50 {results['idle'].get('p50_ms')} ms, p99 {results['idle'].get('p99_ms')} ms.")
+        results['processing'] = run_processing_phase(base_url, work_dir, meeting_ids, args)
+    finally:
+        if process is not None:
+            process.send_signal(signal.SIGTERM) # graceful: the launcher waits for in-flight requests and meetings
+            # Wait past the launcher's own worst case (gunicorn: graceful + 10s, then workers: shutdown timeout), after
+            # which it kills its children itself; killing only the launcher would orphan them in their own sessions.
+            shutdown_wait = args.server_graceful_timeout + 10 + args.server_shutdown_timeout + 30
+            try: results['shutdown_exit_code'] = process.wait(timeout=shutdown_wait)
+            except subprocess.TimeoutExpired:
+                logger.error(f"serve.py did not exit within {shutdown_wait}s; killing it (its gunicorn and worker processes may remain).")
+                process.kill(); process.wait()
+            log.close()
+        if llm_server is not None: llm_server.shutdown()
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    output_path = args.output or os.path.join(RESULTS_DIR, f"load_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
+    with open(output_path, 'w', encoding='utf-8') as f: json.dump(results, f, indent=2)
+    print(f"{'phase':<12} {'req/s':>8} {'p50 ms':>9} {'p99 ms':>9} {'errors':>7}")
+    for phase in ('idle', 'processing'):
+        r = results[phase]; print(f"{phase:<12} {r['rps']:>8.1f} {r.get('p50_ms') or 0:>9.1f} {r.get('p99_ms') or 0:>9.1f} {r['errors']:>7}")
+    print(f"Meetings processed during the test: {results['processing']['meetings_completed']}/{results['processing']['uploads']}"
+          f" ({results['processing']['meetings_failed']} failed). Results written to {output_path}")
+    return results
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,194 @@
+# benchmarks/run_benchmarks.py
+"""
+End-to-end benchmark for the processing pipeline and dashboard routes.
+
+Run from the project root:
+
+    python -m benchmarks.run_benchmarks                      # full run, results in benchmarks/results/
+    python -m benchmarks.run_benchmarks --skip-transcription # no Whisper, NLP + routes only
+    python -m benchmarks.run_benchmarks --compare benchmarks/results/<previous>.json
+
+Everything runs locally: audio is synthesized, the LLM is a stub OpenAI-compatible server,
+and the dashboard is exercised against a generated SQLite dataset in a temporary directory.
+"""
+import os
+import sys
+import json
+import time
+import random
+import shutil
+import logging
+import argparse
+import platform
+import datetime
+import tempfile
+import statistics
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path: sys.path.insert(0, PROJECT_ROOT)
+
+from benchmarks.stub_llm_server import start_stub_llm_server
+from benchmarks import fixtures
+
+logger = logging.getLogger(__name__)
+
+RESULTS_DIR = os.path.join(PROJECT_ROOT, 'benchmarks', 'results')
+ROUTES = ['/', '/tracker', '/decision_tracker', '/calendar', '/api/calendar', '/calendar/action_items.ics', '/meeting/<id>']
+
+
+def percentile(samples, pct):
+    """Nearest-rank percentile of a non-empty list."""
+    ordered = sorted(samples)
+    rank = max(1, int(round(pct / 100.0 * len(ordered))))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+def summarize_latencies(samples_seconds):
+    ms = [s * 1000 for s in samples_seconds]
+    return {'requests': len(ms), 'p50_ms': round(percentile(ms, 50), 3), 'p99_ms': round(percentile(ms, 99), 3),
+            'mean_ms': round(statistics.fmean(ms), 3), 'max_ms': round(max(ms), 3)}
+
+
+def bench_transcription(work_dir, audio_lengths):
+    import transcription
+    results = []
+    for seconds in audio_lengths:
+        path = fixtures.generate_synthetic_audio(os.path.join(work_dir, f"synthetic_{seconds}s.wav"), seconds, seed=seconds)
+        start = time.perf_counter()
+        text = transcription.transcribe_audio(path)
+        elapsed = time.perf_counter() - start
+        results.append({'audio_seconds': seconds, 'wall_seconds': round(elapsed, 3), 'rtf': round(elapsed / seconds, 4),
+                        'transcript_chars': len(text or ""), 'model': transcription.MODEL_SIZE})
+        logger.info(f"Transcription {seconds}s audio: {elapsed:.2f}s (RTF {elapsed / seconds:.3f}).")
+    return results
+
+
+def bench_nlp(transcript_word_counts, repeats):
+    import nlp_processor
+    results = []
+    for words in transcript_word_counts:
+        transcript = fixtures.generate_transcript(words, seed=words)
+        timings = {'summary': [], 'action_items': [], 'decisions': [], 'total': []}
+        for _ in range(repeats):
+            t0 = time.perf_counter(); nlp_processor.generate_summary(transcript)
+            t1 = time.perf_counter(); nlp_processor.extract_action_items(transcript)
+            t2 = time.perf_counter(); nlp_processor.extract_decisions(transcript)
+            t3 = time.perf_counter()
+            timings['summary'].append(t1 - t0); timings['action_items'].append(t2 - t1)
+            timings['decisions'].append(t3 - t2); timings['total'].append(t3 - t0)
+        results.append({'transcript_words': words, 'transcript_chars': len(transcript),
+                        **{f"{stage}_mean_ms": round(statistics.fmean(v) * 1000, 3) for stage, v in timings.items()}})
+        logger.info(f"NLP {words} words: {statistics.fmean(timings['total']) * 1000:.1f} ms mean wall time.")
+    return results
+
+
+def bench_routes(flask_app, meeting_ids, requests_per_route, seed=0):
+    """
+    Latency per route in three cache states, since the app keeps rendered pages in a per-process LRU:
+
+        cold          response cache cleared before the request, so the query and render run (top-level p50/p99)
+        warm          the same URL again right after, served from the response cache
+        not_modified  conditional GET with the ETag just received, answered 304 (routes with validators only)
+    """
+    import app as app_module
+    client = flask_app.test_client(); rng = random.Random(seed)
+    results = {}
+    for route in ROUTES:
+        cold, warm, not_modified = [], [], []
+        for _ in range(requests_per_route):
+            url = route.replace('<id>', str(rng.choice(meeting_ids))) if '<id>' in route else route
+            app_module.clear_response_cache()
+            start = time.perf_counter(); response = client.get(url); cold.append(time.perf_counter() - start)
+            if response.status_code >= 400: raise RuntimeError(f"GET {url} returned {response.status_code}")
+            start = time.perf_counter(); client.get(url); warm.append(time.perf_counter() - start)
+            etag = response.headers.get('ETag')
+            if etag:
+                start = time.perf_counter(); client.get(url, headers={'If-None-Match': etag}); not_modified.append(time.perf_counter() - start)
+        results[route] = {'cache': 'cold', **summarize_latencies(cold), 'warm': summarize_latencies(warm),
+                          'not_modified': summarize_latencies(not_modified) if not_modified else None}
+        logger.info(f"GET {route}: cold p50 {results[route]['p50_ms']:.1f} ms, p99 {results[route]['p99_ms']:.1f} ms; "
+                    f"warm p50 {results[route]['warm']['p50_ms']:.1f} ms.")
+    return results
+
+
+def compare_results(previous, current):
+    """Returns printable lines comparing numeric metrics of two result files (negative delta = faster)."""
+    lines = []
+    def row(label, old, new):
+        if old is None or new is None: return
+        delta = (new - old) / old * 100 if old else 0.0
+        lines.append(f"{label:<48} {old:>12.3f} {new:>12.3f} {delta:>+8.1f}%")
+    lines.append(f"{'metric':<48} {'previous':>12} {'current':>12} {'delta':>9}")
+    for route, stats in current.get('routes', {}).items():
+        old = previous.get('routes', {}).get(route, {})
+        if stats.get('cache') != old.get('cache'): continue # older result files mixed cached and rendered requests
+        for key in ('p50_ms', 'p99_ms'): row(f"route {route} {key}", old.get(key), stats.get(key))
+        for key in ('p50_ms', 'p99_ms'): row(f"route {route} warm {key}", (old.get('warm') or {}).get(key), (stats.get('warm') or {}).get(key))
+    old_nlp = {r['transcript_words']: r for r in previous.get('nlp', [])}
+    for r in current.get('nlp', []):
+        row(f"nlp {r['transcript_words']} words total_mean_ms", old_nlp.get(r['transcript_words'], {}).get('total_mean_ms'), r['total_mean_ms'])
+    old_tx = {r['audio_seconds']: r for r in previous.get('transcription', [])}
+    for r in current.get('transcription', []):
+        row(f"transcription {r['audio_seconds']}s rtf", old_tx.get(r['audio_seconds'], {}).get('rtf'), r['rtf'])
+    return lines
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark transcription, NLP and dashboard routes with local fixtures.")
+    parser.add_argument('--meetings', type=int, default=5000, help="Meetings in the generated SQLite dataset.")
+    parser.add_argument('--audio-lengths', type=int, nargs='+', default=[10, 60, 300], help="Synthetic audio lengths in seconds.")
+    parser.add_argument('--transcript-words', type=int, nargs='+', default=[500, 2000, 8000], help="Transcript sizes for the NLP benchmark.")
+    parser.add_argument('--nlp-repeats', type=int, default=5)
+    parser.add_argument('--requests', type=int, default=50, help="Requests per route for the latency benchmark.")
+    parser.add_argument('--llm-latency-ms', type=float, default=50.0, help="Artificial latency of the stub LLM server.")
+    parser.add_argument('--skip-transcription', action='store_true', help="Skip the Whisper benchmark (no model download).")
+    parser.add_argument('--output', help="Result file path (default: benchmarks/results/<timestamp>.json).")
+    parser.add_argument('--compare', help="Previous result file to compare against.")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+    if not logging.getLogger().hasHandlers():
+        logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+    work_dir = tempfile.mkdtemp(prefix='meeting_bench_')
+    server, base_url = start_stub_llm_server(latency_seconds=args.llm_latency_ms / 1000.0)
+    # Must be set before nlp_processor is imported: it builds its OpenAI client at import time.
+    os.environ['OPENAI_API_KEY'] = 'benchmark-stub-key'; os.environ['OPENAI_BASE_URL'] = base_url
+    # Importing app in inline mode loads the Whisper model; route benchmarks do not need it.
+    if args.skip_transcription: os.environ['PROCESSING_MODE'] = 'external'
+    original_cwd = os.getcwd()
+    try:
+        os.chdir(work_dir) # app.py writes uploads/ relative to the working directory
+        db_path = os.path.join(work_dir, 'benchmark.db')
+        start = time.perf_counter()
+        meeting_ids = fixtures.generate_dataset(db_path, args.meetings, seed=args.seed)
+        dataset_seconds = time.perf_counter() - start
+        import database
+        database.DATABASE_NAME = db_path # before importing app, whose import-time init_db() uses it
+
+        results = {
+            'timestamp': datetime.datetime.now().isoformat(timespec='seconds'),
+            'environment': {'python': platform.python_version(), 'platform': platform.platform(), 'cpu_count': os.cpu_count()},
+            'config': {k: v for k, v in vars(args).items() if k not in ('output', 'compare')},
+            'dataset': {'meetings': args.meetings, 'db_bytes': os.path.getsize(db_path), 'generation_seconds': round(dataset_seconds, 3)},
+        }
+        results['transcription'] = [] if args.skip_transcription else bench_transcription(work_dir, args.audio_lengths)
+        results['nlp'] = bench_nlp(args.transcript_words, args.nlp_repeats)
+        from app import app as flask_app
+        results['routes'] = bench_routes(flask_app, meeting_ids, args.requests, seed=args.seed)
+    finally:
+        os.chdir(original_cwd)
+        server.shutdown()
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    output_path = args.output or os.path.join(RESULTS_DIR, f"bench_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
+    with open(output_path, 'w', encoding='utf-8') as f: json.dump(results, f, indent=2)
+    print(f"Results written to {output_path}")
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f: previous = json.load(f)
+        print("\n".join(compare_results(previous, results)))
+    return results
+
+
+if __name__ == '__main__':
+    main()
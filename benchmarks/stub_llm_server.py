@@ -0,0 +1,101 @@
+# benchmarks/stub_llm_server.py
+import json
+import time
+import logging
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+logger = logging.getLogger(__name__)
+
+STUB_SUMMARY = """- The team reviewed the Q2 results; overall numbers are on target.
+- Marketing reported a 20% increase in leads from the latest campaign.
+- Lead-to-sale conversion remains low and needs attention.
+- The sales funnel will be the focus for Q3."""
+
+STUB_ACTION_ITEMS = [
+    {"task": "Analyze the current sales funnel and identify bottlenecks", "owner": "Bob", "due_date": "Next Friday"},
+    {"task": "Research CRM tools for automated follow-ups", "owner": "Charlie", "due_date": "In two weeks"},
+    {"task": "Prepare the quarterly report", "owner": "Alice", "due_date": None},
+]
+
+STUB_DECISIONS = [
+    "The team will focus on improving the sales funnel in Q3.",
+    "Budget for the CRM evaluation has been approved.",
+]
+
+
+def _stub_content(system_message, response_format=None):
+    """
+    Picks a canned response based on which extractor the system message belongs to. With a JSON response_format
+    the extractors get {"action_items": [...]} / {"decisions": [...]}, as a real model in JSON mode returns.
+    """
+    lowered = (system_message or "").lower()
+    json_mode = (response_format or {}).get("type") in ("json_object", "json_schema")
+    if "action item" in lowered: return json.dumps({"action_items": STUB_ACTION_ITEMS} if json_mode else STUB_ACTION_ITEMS)
+    if "decision" in lowered: return json.dumps({"decisions": STUB_DECISIONS} if json_mode else STUB_DECISIONS)
+    return STUB_SUMMARY
+
+
+class StubLLMHandler(BaseHTTPRequestHandler):
+    """Answers OpenAI-compatible POST /v1/chat/completions requests with deterministic content."""
+    latency_seconds = 0.0
+
+    def do_POST(self):
+        if not self.path.rstrip('/').endswith('/chat/completions'):
+            self.send_error(404, "Only /v1/chat/completions is stubbed."); return
+        body = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))) or b'{}')
+        messages = body.get('messages', [])
+        system_message = next((m.get('content') for m in messages if m.get('role') == 'system'), "")
+        prompt_chars = sum(len(m.get('content') or "") for m in messages)
+        if self.latency_seconds: time.sleep(self.latency_seconds)
+        content = _stub_content(system_message, body.get('response_format'))
+        payload = {
+            "id": "chatcmpl-stub", "object": "chat.completion", "created": int(time.time()), "model": body.get('model', 'stub'),
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}],
+            # Rough 4 chars/token estimate so the token histograms get plausible values.
+            "usage": {"prompt_tokens": prompt_chars // 4, "completion_tokens": len(content) // 4, "total_tokens": (prompt_chars + len(content)) // 4},
+        }
+        encoded = json.dumps(payload).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(encoded)))
+        self.end_headers()
+        self.wfile.write(encoded)
+
+    def log_message(self, format, *args):
+        logger.debug("stub-llm: " + format % args)
+
+
+def start_stub_llm_server(host='127.0.0.1', port=0, latency_seconds=0.0):
+    """
+    Starts the stub LLM server on a background thread.
+
+    Args:
+        host (str): Interface to bind.
+        port (int): Port to bind; 0 picks a free port.
+        latency_seconds (float): Artificial delay added to every completion, to mimic network/model latency.
+
+    Returns:
+        tuple: (server, base_url) where base_url is suitable for OPENAI_BASE_URL. Call server.shutdown() to stop it.
+    """
+    handler = type('ConfiguredStubLLMHandler', (StubLLMHandler,), {'latency_seconds': latency_seconds})
+    server = ThreadingHTTPServer((host, port), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://{server.server_address[0]}:{server.server_address[1]}/v1"
+    logger.info(f"Stub LLM server listening on {base_url} (latency {latency_seconds * 1000:.0f} ms).")
+    return server, base_url
+
+
+if __name__ == '__main__':
+    import argparse
+    parser = argparse.ArgumentParser(description="Run the stub OpenAI-compatible LLM server standalone.")
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--latency-ms', type=float, default=50.0)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    server, url = start_stub_llm_server(port=args.port, latency_seconds=args.latency_ms / 1000.0)
+    print(f"Set OPENAI_BASE_URL={url} and any OPENAI_API_KEY to use it. Ctrl+C to stop.")
+    try:
+        while True: time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
@@ -2,8 +2,20 @@
 import sqlite3
 import datetime
 import logging
+import re
+import time
+import zlib
+
+import dateparser
+
+import dedup
 
 DATABASE_NAME = 'meetings.db'
+SUMMARY_PREVIEW_LENGTH = 100
+TRANSCRIPT_COMPRESSION_MIN_CHARS = 512 # shorter transcripts (e.g. 'Transcription failed.') are stored as plain text
+DUE_DATE_LANGUAGES = ['en'] # transcripts come from the English-only Whisper model; unrestricted detection is ~100x slower on misses
+UNSET_OWNERS = {'', 'n/a', 'na', 'none', 'null', 'unassigned', 'unknown', 'tbd', 'not mentioned', 'not specified'}
+UNSET_DUE_DATES = {'', 'n/a', 'na', 'none', 'null', 'tbd', 'not mentioned', 'not specified'}
 logger = logging.getLogger(__name__)
 
 def adapt_datetime_iso(val):
@@ -25,11 +37,259 @@ def convert_timestamp(val):
 sqlite3.register_adapter(datetime.datetime, adapt_datetime_iso)
 sqlite3.register_converter("timestamp", convert_timestamp)
 
+class TimedCursor(sqlite3.Cursor):
+    """Cursor that adds the time spent executing and fetching to its connection's query_seconds."""
+    def _timed(self, method, *args):
+        start = time.perf_counter()
+        try: return method(*args)
+        finally: self.connection.query_seconds += time.perf_counter() - start
+
+    def execute(self, *args): return self._timed(super().execute, *args)
+    def executemany(self, *args): return self._timed(super().executemany, *args)
+    def fetchone(self): return self._timed(super().fetchone)
+    def fetchmany(self, *args): return self._timed(super().fetchmany, *args)
+    def fetchall(self): return self._timed(super().fetchall)
+
+class TimedConnection(sqlite3.Connection):
+    """Connection whose cursors accumulate query time, so callers can report DB time per request."""
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.query_seconds = 0.0
+
+    def cursor(self, factory=TimedCursor):
+        return super().cursor(factory)
+
 def get_db_connection():
-    conn = sqlite3.connect(DATABASE_NAME, detect_types=sqlite3.PARSE_DECLTYPES)
+    conn = sqlite3.connect(DATABASE_NAME, detect_types=sqlite3.PARSE_DECLTYPES, factory=TimedConnection)
     conn.row_factory = sqlite3.Row
     return conn
 
+def make_summary_preview(summary):
+    """Short list-view version of a summary, stored next to it so the home page never reads full summaries."""
+    if summary is None: return None
+    return summary[:SUMMARY_PREVIEW_LENGTH] + '...' if len(summary) > SUMMARY_PREVIEW_LENGTH else summary
+
+def parse_due_date(due_date_text, relative_base=None):
+    """
+    Normalizes an extracted due date ('Next Friday', 'In two weeks', '2024-07-01') to a datetime.date, or None.
+    Relative phrases are resolved against relative_base, normally when the meeting took place.
+    """
+    if due_date_text is None or str(due_date_text).strip().lower() in UNSET_DUE_DATES: return None
+    settings = {'PREFER_DATES_FROM': 'future', 'RETURN_AS_TIMEZONE_AWARE': False}
+    if relative_base is not None: settings['RELATIVE_BASE'] = relative_base
+    text = str(due_date_text).strip()
+    try: return datetime.date.fromisoformat(text)
+    except ValueError: pass
+    base = relative_base or datetime.datetime.now()
+    period_end = re.fullmatch(r'(?:by |before )?(?:the )?end of (?:the |this )?(week|month)', text, re.IGNORECASE)
+    if period_end: # dateparser has no notion of period ends
+        if period_end.group(1).lower() == 'week': return (base + datetime.timedelta(days=(4 - base.weekday()) % 7)).date() # Friday
+        next_month = (base.replace(day=1) + datetime.timedelta(days=32)).replace(day=1)
+        return (next_month - datetime.timedelta(days=1)).date()
+    try:
+        # 'Next Friday' / 'by Friday' are not understood as such, but 'Friday' with PREFER_DATES_FROM=future is.
+        parsed = (dateparser.parse(text, languages=DUE_DATE_LANGUAGES, settings=settings)
+                  or dateparser.parse(re.sub(r'^(?:next|by|on|before|due)\s+', '', text, flags=re.IGNORECASE), languages=DUE_DATE_LANGUAGES, settings=settings))
+    except Exception as e:
+        logger.warning(f"Could not parse due date '{due_date_text}': {e}"); return None
+    return parsed.date() if parsed else None
+
+def normalize_owner_name(name):
+    """Canonical form of an owner name ('  alice ' and 'Alice.' -> 'alice'), or None when no owner was given."""
+    if name is None: return None
+    normalized = " ".join(re.sub(r"[^\w\s'-]", " ", str(name)).split()).casefold()
+    return None if normalized in UNSET_OWNERS else normalized
+
+def get_or_create_owner(cursor, name):
+    """Returns the owners.id for a name, creating the owner on first sight; None when no owner was given."""
+    normalized = normalize_owner_name(name)
+    if normalized is None: return None
+    cursor.execute("INSERT OR IGNORE INTO owners (name, normalized_name) VALUES (?, ?)", (" ".join(str(name).split()), normalized))
+    cursor.execute("SELECT id FROM owners WHERE normalized_name = ?", (normalized,))
+    return cursor.fetchone()['id']
+
+def store_action_item(cursor, meeting_id, task, owner, due_date, due_date_parsed):
+    """
+    Stores an extracted action item. If a pending item of the same owner already says nearly the same thing
+    (see dedup.find_duplicate), this meeting is linked to it in action_item_occurrences instead of adding a row.
+
+    Returns:
+        tuple: (action_item_id, duplicate_of_existing)
+    """
+    owner_id = get_or_create_owner(cursor, owner)
+    signature = dedup.minhash_signature(task)
+    duplicate_id, similarity = dedup.find_duplicate(cursor, signature, owner_id, meeting_id)
+    if duplicate_id is not None:
+        cursor.execute("""
+            INSERT INTO action_item_occurrences (action_item_id, meeting_id, task, owner, due_date, due_date_parsed, similarity)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+            """, (duplicate_id, meeting_id, task, owner, due_date, due_date_parsed, round(similarity, 3)))
+        # A repeated item keeps its row, but picks up a due date if it did not have one yet.
+        cursor.execute("UPDATE action_items SET due_date = ?, due_date_parsed = ? WHERE id = ? AND due_date_parsed IS NULL AND ? IS NOT NULL",
+                       (due_date, due_date_parsed, duplicate_id, due_date_parsed))
+        if cursor.rowcount: bump_action_item_meetings(cursor, duplicate_id) # earlier meetings show the item too
+        logger.info(f"Action item '{task[:50]}' for meeting {meeting_id} duplicates item {duplicate_id} (similarity {similarity:.2f}); linked.")
+        return duplicate_id, True
+    cursor.execute("INSERT INTO action_items (meeting_id, task, owner, owner_id, due_date, due_date_parsed) VALUES (?, ?, ?, ?, ?, ?)",
+                   (meeting_id, task, owner, owner_id, due_date, due_date_parsed))
+    action_item_id = cursor.lastrowid
+    dedup.index_action_item(cursor, action_item_id, signature)
+    return action_item_id, False
+
+def delete_meeting_action_items(cursor, meeting_id):
+    """
+    Removes a meeting's action items. Items that other meetings repeated are kept and handed to the earliest
+    of those meetings. Returns the ids of the other meetings whose items changed.
+    """
+    cursor.execute("DELETE FROM action_item_occurrences WHERE meeting_id = ?", (meeting_id,))
+    cursor.execute("""
+        SELECT ai.id, MIN(o.id) AS occurrence_id FROM action_items ai JOIN action_item_occurrences o ON o.action_item_id = ai.id
+        WHERE ai.meeting_id = ? GROUP BY ai.id
+        """, (meeting_id,))
+    affected_meetings = set()
+    for row in cursor.fetchall():
+        cursor.execute("SELECT meeting_id, task, owner FROM action_item_occurrences WHERE id = ?", (row['occurrence_id'],)); occurrence = cursor.fetchone()
+        cursor.execute("UPDATE action_items SET meeting_id = ?, task = ?, owner = ?, owner_id = ? WHERE id = ?",
+                       (occurrence['meeting_id'], occurrence['task'], occurrence['owner'], get_or_create_owner(cursor, occurrence['owner']), row['id']))
+        # Later duplicates are matched against the wording the item now has.
+        dedup.unindex_action_items(cursor, [row['id']]); dedup.index_action_item(cursor, row['id'], dedup.minhash_signature(occurrence['task']))
+        cursor.execute("DELETE FROM action_item_occurrences WHERE id = ?", (row['occurrence_id'],))
+        affected_meetings.add(occurrence['meeting_id'])
+    cursor.execute("SELECT id FROM action_items WHERE meeting_id = ?", (meeting_id,))
+    dedup.unindex_action_items(cursor, [row['id'] for row in cursor.fetchall()])
+    cursor.execute("DELETE FROM action_items WHERE meeting_id = ?", (meeting_id,))
+    return affected_meetings
+
+def _backfill_owners_and_signatures(cursor):
+    """Links existing action items to owners and indexes them for de-duplication (existing rows are not merged)."""
+    cursor.execute("SELECT id, task, owner FROM action_items")
+    rows = cursor.fetchall()
+    for row in rows:
+        cursor.execute("UPDATE action_items SET owner_id = ? WHERE id = ?", (get_or_create_owner(cursor, row['owner']), row['id']))
+        dedup.index_action_item(cursor, row['id'], dedup.minhash_signature(row['task']))
+    return len(rows)
+
+def _backfill_due_dates(cursor):
+    """Parses due dates of action items stored before due_date_parsed existed. Returns the number parsed."""
+    cursor.execute("""
+        SELECT ai.id, ai.due_date, m.scheduled_datetime, m.upload_time FROM action_items ai JOIN meetings m ON ai.meeting_id = m.id
+        WHERE ai.due_date IS NOT NULL AND ai.due_date_parsed IS NULL
+        """)
+    parsed = [(parse_due_date(row['due_date'], row['scheduled_datetime'] or row['upload_time']), row['id']) for row in cursor.fetchall()]
+    parsed = [(due, item_id) for due, item_id in parsed if due is not None]
+    cursor.executemany("UPDATE action_items SET due_date_parsed = ? WHERE id = ?", parsed)
+    return len(parsed)
+
+def save_transcript(cursor, meeting_id, transcript):
+    """Stores a meeting's transcript in meeting_content, zlib-compressed when it is large enough to benefit."""
+    if transcript is None:
+        cursor.execute("DELETE FROM meeting_content WHERE meeting_id = ?", (meeting_id,)); return
+    if len(transcript) >= TRANSCRIPT_COMPRESSION_MIN_CHARS:
+        payload, encoding = zlib.compress(transcript.encode('utf-8'), 6), 'zlib'
+    else:
+        payload, encoding = transcript, 'text'
+    cursor.execute("INSERT OR REPLACE INTO meeting_content (meeting_id, transcript, encoding) VALUES (?, ?, ?)", (meeting_id, payload, encoding))
+
+def load_transcript(cursor, meeting_id):
+    """Returns a meeting's transcript text, or None if it has none."""
+    cursor.execute("SELECT transcript, encoding FROM meeting_content WHERE meeting_id = ?", (meeting_id,))
+    row = cursor.fetchone()
+    if row is None or row['transcript'] is None: return None
+    if row['encoding'] == 'zlib': return zlib.decompress(row['transcript']).decode('utf-8')
+    return row['transcript']
+
+def _utc_now():
+    return datetime.datetime.now(datetime.timezone.utc).replace(tzinfo=None)
+
+def bump_data_version(cursor):
+    """Marks a change somewhere in the data; validators of cross-meeting views (trackers, calendar) derive from it."""
+    cursor.execute("UPDATE data_version SET version = version + 1, updated_at = ? WHERE id = 1", (_utc_now(),))
+
+def bump_meeting_version(cursor, meeting_id):
+    """Marks a change to one meeting (status, summary, its action items or decisions), and to the data overall."""
+    cursor.execute("UPDATE meetings SET version = COALESCE(version, 0) + 1, updated_at = ? WHERE id = ?", (_utc_now(), meeting_id))
+    bump_data_version(cursor)
+
+def bump_action_item_meetings(cursor, action_item_id):
+    """Bumps the version of every meeting that shows an action item: the one that raised it and those that repeated it."""
+    cursor.execute("SELECT meeting_id FROM action_items WHERE id = ? UNION SELECT meeting_id FROM action_item_occurrences WHERE action_item_id = ?", (action_item_id, action_item_id))
+    for row in cursor.fetchall(): bump_meeting_version(cursor, row['meeting_id'])
+
+def get_meeting_version(cursor, meeting_id):
+    """Returns (version, updated_at as naive UTC or None) for a meeting, or None if it does not exist."""
+    cursor.execute("SELECT version, updated_at FROM meetings WHERE id = ?", (meeting_id,))
+    row = cursor.fetchone()
+    return (row['version'] or 0, row['updated_at']) if row else None
+
+def get_data_version(cursor):
+    """Returns (version, updated_at as naive UTC or None) of the data as a whole."""
+    cursor.execute("SELECT version, updated_at FROM data_version WHERE id = 1")
+    row = cursor.fetchone()
+    return (row['version'], row['updated_at']) if row else (0, None)
+
+IN_PROGRESS_STATUSES = ('starting', 'transcribing', 'processing_nlp')
+MAX_PROCESSING_ATTEMPTS = 3 # a meeting that keeps killing its worker (OOM, decoder crash) must not block the queue forever
+
+def claim_next_job(cursor, worker_name):
+    """
+    Atomically takes the oldest 'queued' meeting for a processing worker. A single UPDATE ... RETURNING holds
+    SQLite's write lock, so two workers can never claim the same meeting. Returns the meeting id, or None.
+    The caller commits.
+    """
+    cursor.execute("""
+        UPDATE meetings SET processing_status = 'starting', claimed_by = ?, claimed_at = ?, processing_attempts = COALESCE(processing_attempts, 0) + 1
+        WHERE id = (SELECT id FROM meetings WHERE processing_status = 'queued' ORDER BY id LIMIT 1)
+        RETURNING id
+        """, (worker_name, _utc_now()))
+    row = cursor.fetchone()
+    return row['id'] if row else None
+
+def requeue_interrupted_jobs(cursor, worker_name=None):
+    """
+    Puts meetings a worker had claimed but not finished (it was killed or crashed) back in the queue: those of
+    worker_name, or of every worker when None, which is only safe while no workers are running. Meetings that
+    already used MAX_PROCESSING_ATTEMPTS claims are marked 'error' instead. Returns the number requeued.
+    """
+    interrupted = f"claimed_by IS NOT NULL AND (? IS NULL OR claimed_by = ?) AND processing_status IN ({','.join('?' * len(IN_PROGRESS_STATUSES))})"
+    params = (worker_name, worker_name, *IN_PROGRESS_STATUSES)
+    message = f"Proc. Error: processing was interrupted {MAX_PROCESSING_ATTEMPTS} times (the worker crashed or was killed); giving up."
+    cursor.execute(f"""
+        UPDATE meetings SET processing_status = 'error', claimed_by = NULL, summary = ?, summary_preview = ?
+        WHERE {interrupted} AND COALESCE(processing_attempts, 0) >= ?
+        RETURNING id
+        """, (message, make_summary_preview(message), *params, MAX_PROCESSING_ATTEMPTS))
+    failed = [row['id'] for row in cursor.fetchall()]
+    for meeting_id in failed:
+        logger.error(f"Meeting {meeting_id} was interrupted {MAX_PROCESSING_ATTEMPTS} times; marked as failed instead of requeueing.")
+    cursor.execute(f"UPDATE meetings SET processing_status = 'queued', claimed_by = NULL WHERE {interrupted} RETURNING id", params)
+    requeued = [row['id'] for row in cursor.fetchall()]
+    for meeting_id in failed + requeued: bump_meeting_version(cursor, meeting_id)
+    return len(requeued)
+
+def record_worker_heartbeat(cursor, worker_name, pid, current_meeting_id=None):
+    cursor.execute("""
+        INSERT INTO processing_workers (name, pid, heartbeat_at, current_meeting_id) VALUES (?, ?, ?, ?)
+        ON CONFLICT (name) DO UPDATE SET pid = excluded.pid, heartbeat_at = excluded.heartbeat_at, current_meeting_id = excluded.current_meeting_id
+        """, (worker_name, pid, _utc_now(), current_meeting_id))
+
+def remove_worker(cursor, worker_name):
+    cursor.execute("DELETE FROM processing_workers WHERE name = ?", (worker_name,))
+
+def count_live_processing_workers(cursor, stale_seconds):
+    """Number of processing workers whose last heartbeat is at most stale_seconds old."""
+    cursor.execute("SELECT COUNT(*) AS n FROM processing_workers WHERE heartbeat_at >= ?", (_utc_now() - datetime.timedelta(seconds=stale_seconds),))
+    return cursor.fetchone()['n']
+
+def _migrate_inline_transcripts(cursor):
+    """Moves transcripts still stored in meetings.transcript into meeting_content. Returns the number moved."""
+    cursor.execute("SELECT id FROM meetings WHERE transcript IS NOT NULL")
+    meeting_ids = [row['id'] for row in cursor.fetchall()]
+    for meeting_id in meeting_ids:
+        cursor.execute("SELECT transcript FROM meetings WHERE id = ?", (meeting_id,))
+        save_transcript(cursor, meeting_id, cursor.fetchone()['transcript'])
+        cursor.execute("UPDATE meetings SET transcript = NULL WHERE id = ?", (meeting_id,))
+    return len(meeting_ids)
+
 def _add_column_if_not_exists(cursor, table_name, column_name, column_type_with_default="TEXT"):
     cursor.execute(f"PRAGMA table_info({table_name})")
     columns = [info[1] for info in cursor.fetchall()]
@@ -39,9 +299,20 @@ def _add_column_if_not_exists(cursor, table_name, column_name, column_type_with_
         return True
     return False
 
+INIT_DB_LOCK_TIMEOUT_MS = 10 * 60 * 1000 # another process may be running a long migration or backfill
+
 def init_db():
+    """
+    Creates and migrates the schema. Safe to run from several processes at once (e.g. gunicorn workers without
+    --preload): the checks, ALTERs and backfills run in one BEGIN IMMEDIATE transaction, so later processes wait
+    for the first and then find the schema up to date.
+    """
     conn = get_db_connection()
     cursor = conn.cursor()
+    cursor.execute(f"PRAGMA busy_timeout = {INIT_DB_LOCK_TIMEOUT_MS}")
+    # WAL lets dashboard reads and event streams proceed while background processing writes.
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("BEGIN IMMEDIATE")
 
     cursor.execute('''
     CREATE TABLE IF NOT EXISTS meetings (
@@ -63,6 +334,26 @@ def init_db():
     _add_column_if_not_exists(cursor, "meetings", "end_datetime", "TIMESTAMP")
     _add_column_if_not_exists(cursor, "meetings", "agenda", "TEXT")
     _add_column_if_not_exists(cursor, "meetings", "attendees", "TEXT")
+    # HTTP cache validators: bumped on every change to the meeting (see bump_meeting_version).
+    _add_column_if_not_exists(cursor, "meetings", "version", "INTEGER DEFAULT 0")
+    _add_column_if_not_exists(cursor, "meetings", "updated_at", "TIMESTAMP")
+    _add_column_if_not_exists(cursor, "meetings", "progress_percent", "INTEGER") # transcription progress, for the events stream
+    # Processing queue for worker processes: what to run ('audio' or 'text') and which worker claimed it.
+    _add_column_if_not_exists(cursor, "meetings", "processing_job", "TEXT")
+    _add_column_if_not_exists(cursor, "meetings", "claimed_by", "TEXT")
+    _add_column_if_not_exists(cursor, "meetings", "claimed_at", "TIMESTAMP")
+    _add_column_if_not_exists(cursor, "meetings", "processing_attempts", "INTEGER DEFAULT 0") # claims so far, see MAX_PROCESSING_ATTEMPTS
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_meetings_processing_status ON meetings (processing_status)")
+    if _add_column_if_not_exists(cursor, "meetings", "summary_preview", "TEXT"):
+        cursor.execute(f"""
+            UPDATE meetings SET summary_preview = CASE WHEN length(summary) > {SUMMARY_PREVIEW_LENGTH}
+                THEN substr(summary, 1, {SUMMARY_PREVIEW_LENGTH}) || '...' ELSE summary END
+            WHERE summary IS NOT NULL
+            """)
+        logger.info(f"Backfilled summary_preview for {cursor.rowcount} existing meetings.")
+    # Range lookups for the calendar API; string comparison works for both ISO ('T') and SQLite (' ') timestamp formats.
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_meetings_upload_time ON meetings (upload_time)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_meetings_scheduled_datetime ON meetings (scheduled_datetime)")
 
     cursor.execute('''
     CREATE TABLE IF NOT EXISTS action_items (
@@ -86,10 +377,91 @@ def init_db():
         FOREIGN KEY (meeting_id) REFERENCES meetings (id) ON DELETE CASCADE
     )
     ''')
+    # Due dates are parsed once, when items are stored, instead of on every calendar export.
+    if _add_column_if_not_exists(cursor, "action_items", "due_date_parsed", "DATE"):
+        logger.info(f"Backfilled due_date_parsed for {_backfill_due_dates(cursor)} existing action items.")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_action_items_status ON action_items (status)")
+
+    # Owners are stored once under a normalized name, so "what does Alice owe" is an indexed lookup on owner_id.
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS owners (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        name TEXT NOT NULL,                   -- display form, as first seen
+        normalized_name TEXT NOT NULL UNIQUE
+    )
+    ''')
+    # Later meetings repeating a pending item are linked to it here instead of adding another action_items row.
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS action_item_occurrences (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        action_item_id INTEGER NOT NULL,
+        meeting_id INTEGER NOT NULL,
+        task TEXT NOT NULL,                   -- wording used in this meeting
+        owner TEXT,
+        due_date TEXT,
+        due_date_parsed DATE,
+        similarity REAL,
+        FOREIGN KEY (action_item_id) REFERENCES action_items (id) ON DELETE CASCADE,
+        FOREIGN KEY (meeting_id) REFERENCES meetings (id) ON DELETE CASCADE
+    )
+    ''')
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_action_item_occurrences_item ON action_item_occurrences (action_item_id)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_action_item_occurrences_meeting ON action_item_occurrences (meeting_id)")
+    # MinHash signatures and LSH buckets of action item tasks, see dedup.py.
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS action_item_signatures (
+        action_item_id INTEGER PRIMARY KEY,
+        signature BLOB NOT NULL,
+        FOREIGN KEY (action_item_id) REFERENCES action_items (id) ON DELETE CASCADE
+    )
+    ''')
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS action_item_lsh (
+        bucket INTEGER NOT NULL,
+        action_item_id INTEGER NOT NULL,
+        PRIMARY KEY (bucket, action_item_id)
+    ) WITHOUT ROWID
+    ''')
+    if _add_column_if_not_exists(cursor, "action_items", "owner_id", "INTEGER REFERENCES owners (id)"):
+        logger.info(f"Linked {_backfill_owners_and_signatures(cursor)} existing action items to owners and the duplicate index.")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_action_items_owner_id ON action_items (owner_id, status)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_action_items_meeting_id ON action_items (meeting_id)")
     _add_column_if_not_exists(cursor, "decisions", "status", "TEXT DEFAULT 'open'")
     _add_column_if_not_exists(cursor, "decisions", "resolution_notes", "TEXT")
+
+    # Large transcripts live outside the hot meetings rows; meetings.transcript is kept only as a legacy column.
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS meeting_content (
+        meeting_id INTEGER PRIMARY KEY,
+        transcript BLOB,
+        encoding TEXT NOT NULL DEFAULT 'text', -- 'text' or 'zlib'
+        FOREIGN KEY (meeting_id) REFERENCES meetings (id) ON DELETE CASCADE
+    )
+    ''')
+    moved_transcripts = _migrate_inline_transcripts(cursor)
+
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS data_version (
+        id INTEGER PRIMARY KEY CHECK (id = 1),
+        version INTEGER NOT NULL DEFAULT 0,
+        updated_at TIMESTAMP
+    )
+    ''')
+    cursor.execute("INSERT OR IGNORE INTO data_version (id, version, updated_at) VALUES (1, 0, ?)", (_utc_now(),))
+
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS processing_workers (
+        name TEXT PRIMARY KEY,                -- host:pid
+        pid INTEGER,
+        heartbeat_at TIMESTAMP,
+        current_meeting_id INTEGER
+    )
+    ''')
         
     conn.commit()
+    if moved_transcripts:
+        logger.info(f"Moved {moved_transcripts} inline transcripts to meeting_content. Vacuuming to reclaim their pages.")
+        conn.execute("VACUUM")
     conn.close()
     logger.info("Database schema initialized/verified successfully.")
 
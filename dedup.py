@@ -0,0 +1,97 @@
+# dedup.py
+"""
+Near-duplicate detection for action item tasks: MinHash signatures over character shingles, indexed with
+locality-sensitive hashing (LSH) in SQLite so candidates are found with an indexed lookup, not a table scan.
+
+"Prepare the quarterly report" and "Prepare quarterly report." share most shingles and land in a common
+LSH bucket; candidates are then confirmed by the signature-estimated Jaccard similarity.
+"""
+import re
+import random
+import hashlib
+import logging
+from array import array
+
+logger = logging.getLogger(__name__)
+
+SHINGLE_SIZE = 4 # characters
+NUM_PERMUTATIONS = 64
+LSH_BANDS = 16 # 16 bands x 4 rows: pairs above ~0.5 similarity usually share a bucket, above 0.7 almost always
+LSH_ROWS = NUM_PERMUTATIONS // LSH_BANDS
+DUPLICATE_THRESHOLD = 0.7 # estimated Jaccard similarity of shingle sets
+_MERSENNE_PRIME = (1 << 61) - 1
+_STOPWORDS = {'a', 'an', 'the', 'to', 'for', 'of', 'and', 'on', 'in', 'with', 'by', 'our', 'its', 'their'}
+
+# Fixed seed: signatures are stored, so the permutations must be identical in every process and release.
+_rng = random.Random(20240601)
+_PERMUTATIONS = [(_rng.randrange(1, _MERSENNE_PRIME), _rng.randrange(0, _MERSENNE_PRIME)) for _ in range(NUM_PERMUTATIONS)]
+
+def normalize_task(task):
+    """Lowercases, drops punctuation and filler words, and collapses whitespace."""
+    words = re.findall(r"[a-z0-9]+", (task or "").casefold())
+    return " ".join(w for w in words if w not in _STOPWORDS)
+
+def shingles(task):
+    text = normalize_task(task)
+    if len(text) <= SHINGLE_SIZE: return {text} if text else set()
+    return {text[i:i + SHINGLE_SIZE] for i in range(len(text) - SHINGLE_SIZE + 1)}
+
+def _hash64(value):
+    return int.from_bytes(hashlib.blake2b(value.encode('utf-8'), digest_size=8).digest(), 'little')
+
+def minhash_signature(task):
+    """Returns the MinHash signature of a task as a list of NUM_PERMUTATIONS ints, or None for an empty task."""
+    hashed = [_hash64(s) for s in shingles(task)]
+    if not hashed: return None
+    return [min((a * h + b) % _MERSENNE_PRIME for h in hashed) for a, b in _PERMUTATIONS]
+
+def estimated_similarity(signature_a, signature_b):
+    return sum(1 for x, y in zip(signature_a, signature_b) if x == y) / NUM_PERMUTATIONS
+
+def lsh_buckets(signature):
+    """One bucket key per band: the band number in the high bits, a hash of the band's rows in the low 32."""
+    keys = []
+    for band in range(LSH_BANDS):
+        rows = signature[band * LSH_ROWS:(band + 1) * LSH_ROWS]
+        digest = hashlib.blake2b(array('Q', rows).tobytes(), digest_size=4).digest()
+        keys.append((band << 32) | int.from_bytes(digest, 'little'))
+    return keys
+
+def _pack(signature): return array('Q', signature).tobytes()
+
+def _unpack(blob):
+    signature = array('Q'); signature.frombytes(blob)
+    return signature
+
+def index_action_item(cursor, action_item_id, signature):
+    """Stores an action item's signature and LSH buckets so later items can be matched against it."""
+    if signature is None: return
+    cursor.execute("INSERT OR REPLACE INTO action_item_signatures (action_item_id, signature) VALUES (?, ?)", (action_item_id, _pack(signature)))
+    cursor.executemany("INSERT OR IGNORE INTO action_item_lsh (bucket, action_item_id) VALUES (?, ?)",
+                       [(bucket, action_item_id) for bucket in lsh_buckets(signature)])
+
+def unindex_action_items(cursor, action_item_ids):
+    for action_item_id in action_item_ids:
+        cursor.execute("DELETE FROM action_item_lsh WHERE action_item_id = ?", (action_item_id,))
+        cursor.execute("DELETE FROM action_item_signatures WHERE action_item_id = ?", (action_item_id,))
+
+def find_duplicate(cursor, signature, owner_id, meeting_id=None):
+    """
+    Returns (action_item_id, similarity) of the most similar pending action item with the same owner
+    (both unassigned counts as the same) raised in another meeting than meeting_id, or (None, 0.0) if none
+    reaches DUPLICATE_THRESHOLD. Near-identical items within one meeting are kept as separate items.
+    """
+    if signature is None: return None, 0.0
+    buckets = lsh_buckets(signature)
+    cursor.execute(f"""
+        SELECT DISTINCT s.action_item_id, s.signature FROM action_item_lsh l
+        JOIN action_items ai ON ai.id = l.action_item_id
+        JOIN action_item_signatures s ON s.action_item_id = l.action_item_id
+        WHERE l.bucket IN ({','.join('?' * len(buckets))}) AND ai.status = 'pending' AND ai.owner_id IS ? AND ai.meeting_id IS NOT ?
+        """, (*buckets, owner_id, meeting_id))
+    best_id, best_similarity = None, 0.0
+    for row in cursor.fetchall():
+        similarity = estimated_similarity(signature, _unpack(row['signature']))
+        if similarity > best_similarity: best_id, best_similarity = row['action_item_id'], similarity
+    if best_similarity < DUPLICATE_THRESHOLD: return None, best_similarity
+    return best_id, best_similarity
@@ -0,0 +1,69 @@
+# ics_feed.py
+"""
+iCalendar (RFC 5545) output for pending action items.
+
+Written directly rather than through ics.Calendar: the feed covers every pending item across all meetings, and
+building thousands of ics.Event objects (arrow dates, per-event validation) costs about a second per render.
+"""
+from datetime import datetime, timedelta
+
+PRODID = "-//ai-meeting-summarizer//Action Items//EN"
+UID_DOMAIN = "ai-meeting-summarizer"
+REFRESH_INTERVAL = "PT1H" # hint to subscribed clients; revalidation is cheap thanks to the ETag
+
+def _escape(text):
+    return str(text).replace('\\', '\\\\').replace(';', '\\;').replace(',', '\\,').replace('\r\n', '\\n').replace('\n', '\\n')
+
+def _fold(line):
+    """Folds a content line to at most 75 octets per physical line, without splitting UTF-8 characters."""
+    encoded = line.encode('utf-8')
+    if len(encoded) <= 75: return line
+    parts = []; current = ""; current_len = 0; limit = 75
+    for char in line:
+        char_len = len(char.encode('utf-8'))
+        if current_len + char_len > limit:
+            parts.append(current); current = ""; current_len = 0; limit = 74 # continuation lines start with a space
+        current += char; current_len += char_len
+    parts.append(current)
+    return "\r\n ".join(parts)
+
+def _as_date(value):
+    if isinstance(value, datetime): return value.date()
+    return value
+
+def action_item_event_lines(item, dtstamp, meeting_url=None):
+    """
+    VEVENT lines for one action item dict (id, task, owner, due_date, due_date_parsed, meeting_title, meeting_time).
+
+    The event is an all-day event on the parsed due date; items without one are placed on the meeting's day.
+    The UID depends only on the item id, so clients update events in place when the feed changes.
+    """
+    due = _as_date(item.get('due_date_parsed')) or _as_date(item.get('meeting_time')) or dtstamp.date()
+    description = f"Task: {item['task']}"
+    if item.get('owner'): description += f"\nOwner: {item['owner']}"
+    if item.get('due_date') and not item.get('due_date_parsed'): description += f"\nOriginal Due Date (unparsed): {item['due_date']}"
+    if item.get('meeting_title'): description += f"\nMeeting: {item['meeting_title']}"
+    lines = ["BEGIN:VEVENT", f"UID:action-item-{item['id']}@{UID_DOMAIN}", f"DTSTAMP:{dtstamp.strftime('%Y%m%dT%H%M%SZ')}",
+             f"DTSTART;VALUE=DATE:{due.strftime('%Y%m%d')}", f"DTEND;VALUE=DATE:{(due + timedelta(days=1)).strftime('%Y%m%d')}",
+             f"SUMMARY:{_escape('Action: ' + item['task'])}", f"DESCRIPTION:{_escape(description)}"]
+    if meeting_url: lines.append(f"URL:{meeting_url}")
+    lines.append("END:VEVENT")
+    return lines
+
+def render_action_items_calendar(items, dtstamp, calendar_name, meeting_url_for=None):
+    """
+    Returns a VCALENDAR document for the given action item dicts.
+
+    Args:
+        items (iterable): Action item dicts, see action_item_event_lines().
+        dtstamp (datetime): Naive UTC time the data was last changed; used as every event's DTSTAMP so the
+            document is identical for identical data.
+        calendar_name (str): Display name for subscribing clients.
+        meeting_url_for (callable): Optional meeting_id -> absolute URL, linked from each event.
+    """
+    lines = ["BEGIN:VCALENDAR", "VERSION:2.0", f"PRODID:{PRODID}", "CALSCALE:GREGORIAN", "METHOD:PUBLISH",
+             f"X-WR-CALNAME:{_escape(calendar_name)}", f"REFRESH-INTERVAL;VALUE=DURATION:{REFRESH_INTERVAL}", f"X-PUBLISHED-TTL:{REFRESH_INTERVAL}"]
+    for item in items:
+        lines.extend(action_item_event_lines(item, dtstamp, meeting_url_for(item['meeting_id']) if meeting_url_for else None))
+    lines.append("END:VCALENDAR")
+    return "".join(_fold(line) + "\r\n" for line in lines)
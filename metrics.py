@@ -0,0 +1,229 @@
+# metrics.py
+import os
+import json
+import time
+import atexit
+import threading
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Default bucket layouts. Values are upper bounds; +Inf is always appended on render.
+SECONDS_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+BYTES_BUCKETS = (100e3, 500e3, 1e6, 5e6, 10e6, 25e6, 50e6, 100e6)
+AUDIO_SECONDS_BUCKETS = (10, 30, 60, 300, 600, 1200, 1800, 3600, 7200)
+RTF_BUCKETS = (0.05, 0.1, 0.25, 0.5, 0.75, 1, 1.5, 2, 4)
+TOKEN_BUCKETS = (50, 100, 250, 500, 1000, 2000, 4000, 8000, 16000)
+
+_REGISTRY = []
+
+# With several processes (serve.py: gunicorn workers plus processing workers) each process periodically writes its
+# counters and histograms to METRICS_DIR/<pid>.json, and /metrics sums every file, so a scrape sees the whole
+# deployment whichever process answers. Files of exited processes are kept so counters never go backwards.
+METRICS_DIR = os.getenv('METRICS_DIR')
+SNAPSHOT_INTERVAL_SECONDS = 10
+
+
+def _format_labels(label_names, label_values, extra=None):
+    pairs = list(zip(label_names, label_values)) + (list(extra) if extra else [])
+    if not pairs: return ""
+    escaped = [(k, str(v).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')) for k, v in pairs]
+    return "{" + ",".join(f'{k}="{v}"' for k, v in escaped) + "}"
+
+
+def _format_value(value):
+    if value == float('inf'): return "+Inf"
+    if float(value).is_integer(): return str(int(value))
+    return repr(float(value))
+
+
+class _Metric:
+    metric_type = None
+
+    def __init__(self, name, documentation, label_names=()):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(label_names)
+        self._lock = threading.Lock()
+        _REGISTRY.append(self)
+
+    def _key(self, labels):
+        if set(labels) != set(self.label_names):
+            raise ValueError(f"Metric {self.name} expects labels {self.label_names}, got {tuple(labels)}")
+        return tuple(str(labels[n]) for n in self.label_names)
+
+    def render(self, state=None):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.metric_type}"]
+        lines.extend(self._render_samples(state))
+        return lines
+
+
+class Counter(_Metric):
+    metric_type = "counter"
+
+    def __init__(self, name, documentation, label_names=()):
+        super().__init__(name, documentation, label_names)
+        self._values = {}
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock: self._values[key] = self._values.get(key, 0) + amount
+
+    def snapshot(self):
+        with self._lock: return [[list(k), v] for k, v in self._values.items()]
+
+    @staticmethod
+    def merge(state, snapshot):
+        for key, value in snapshot: state[tuple(key)] = state.get(tuple(key), 0) + value
+
+    def _render_samples(self, state=None):
+        if state is None:
+            with self._lock: state = dict(self._values)
+        return [f"{self.name}{_format_labels(self.label_names, k)} {_format_value(v)}" for k, v in sorted(state.items())]
+
+
+class Gauge(_Metric):
+    """A per-process value; not shared through METRICS_DIR, so set process-independent gauges at scrape time."""
+    metric_type = "gauge"
+
+    def __init__(self, name, documentation, label_names=()):
+        super().__init__(name, documentation, label_names)
+        self._values = {}
+
+    def set(self, value, **labels):
+        key = self._key(labels)
+        with self._lock: self._values[key] = value
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock: self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount=1, **labels):
+        self.inc(-amount, **labels)
+
+    def _render_samples(self, state=None):
+        with self._lock: items = sorted(self._values.items())
+        return [f"{self.name}{_format_labels(self.label_names, k)} {_format_value(v)}" for k, v in items]
+
+
+class Histogram(_Metric):
+    metric_type = "histogram"
+
+    def __init__(self, name, documentation, label_names=(), buckets=SECONDS_BUCKETS):
+        super().__init__(name, documentation, label_names)
+        self.buckets = tuple(sorted(buckets))
+        self._series = {} # label key -> [bucket_counts, sum, count]
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None: series = self._series[key] = [[0] * len(self.buckets), 0.0, 0]
+            for i, upper in enumerate(self.buckets):
+                if value <= upper: series[0][i] += 1
+            series[1] += value; series[2] += 1
+
+    def snapshot(self):
+        with self._lock: return [[list(k), list(s[0]), s[1], s[2]] for k, s in self._series.items()]
+
+    @staticmethod
+    def merge(state, snapshot):
+        for key, bucket_counts, total, count in snapshot:
+            series = state.setdefault(tuple(key), [[0] * len(bucket_counts), 0.0, 0])
+            series[0] = [a + b for a, b in zip(series[0], bucket_counts)]; series[1] += total; series[2] += count
+
+    def _render_samples(self, state=None):
+        if state is None:
+            with self._lock: state = {k: (list(s[0]), s[1], s[2]) for k, s in self._series.items()}
+        items = sorted(state.items())
+        lines = []
+        for key, (bucket_counts, total, count) in items:
+            for upper, bucket_count in zip(self.buckets, bucket_counts):
+                lines.append(f"{self.name}_bucket{_format_labels(self.label_names, key, [('le', _format_value(upper))])} {bucket_count}")
+            lines.append(f"{self.name}_bucket{_format_labels(self.label_names, key, [('le', '+Inf')])} {count}")
+            lines.append(f"{self.name}_sum{_format_labels(self.label_names, key)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{_format_labels(self.label_names, key)} {count}")
+        return lines
+
+
+def _shared_metrics():
+    return [m for m in _REGISTRY if hasattr(m, 'snapshot')]
+
+
+def write_snapshot(directory=None):
+    """Writes this process's counters and histograms to <directory>/<pid>.json (atomically replaced)."""
+    directory = directory or METRICS_DIR
+    if not directory: return
+    path = os.path.join(directory, f"{os.getpid()}.json")
+    try:
+        with open(path + ".tmp", "w", encoding="utf-8") as f: json.dump({m.name: m.snapshot() for m in _shared_metrics()}, f)
+        os.replace(path + ".tmp", path)
+    except OSError as e:
+        logger.warning(f"Could not write metrics snapshot to {path}: {e}")
+
+
+def _merged_states(directory):
+    """Sums the snapshot files of every process; this process's file is rewritten first so it is current."""
+    write_snapshot(directory)
+    states = {m.name: {} for m in _shared_metrics()}; merge_by_name = {m.name: m.merge for m in _shared_metrics()}
+    for filename in os.listdir(directory):
+        if not filename.endswith(".json"): continue
+        try:
+            with open(os.path.join(directory, filename), encoding="utf-8") as f: snapshot = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Skipping unreadable metrics snapshot {filename}: {e}"); continue
+        for name, data in snapshot.items():
+            if name in states: merge_by_name[name](states[name], data)
+    return states
+
+
+def start_snapshot_writer(directory=None, interval=SNAPSHOT_INTERVAL_SECONDS):
+    """Writes snapshots every `interval` seconds and at exit, when a metrics directory is configured."""
+    directory = directory or METRICS_DIR
+    if not directory: return None
+    os.makedirs(directory, exist_ok=True)
+    def loop():
+        while True:
+            time.sleep(interval); write_snapshot(directory)
+    atexit.register(write_snapshot, directory)
+    thread = threading.Thread(target=loop, name='metrics-snapshot', daemon=True); thread.start()
+    return thread
+
+
+def render_metrics(meeting_status_counts=None):
+    """
+    Renders every registered metric in the Prometheus text exposition format; with METRICS_DIR, counters and
+    histograms are summed over all processes' snapshots.
+
+    Args:
+        meeting_status_counts (dict): Optional {processing_status: count} read from the meetings table
+                                      at scrape time, exported as a gauge rather than tracked in memory.
+
+    Returns:
+        str: The exposition body, newline terminated.
+    """
+    lines = []
+    states = _merged_states(METRICS_DIR) if METRICS_DIR else {}
+    for metric in _REGISTRY:
+        lines.extend(metric.render(states.get(metric.name)))
+    if meeting_status_counts is not None:
+        lines.append("# HELP meetings_by_processing_status Number of meetings in each processing_status, read from the meetings table.")
+        lines.append("# TYPE meetings_by_processing_status gauge")
+        for status, count in sorted(meeting_status_counts.items(), key=lambda kv: str(kv[0])):
+            lines.append(f"meetings_by_processing_status{_format_labels(('status',), (status if status is not None else 'unknown',))} {count}")
+    return "\n".join(lines) + "\n"
+
+
+# --- Application metrics ---
+UPLOAD_SIZE_BYTES = Histogram("upload_size_bytes", "Size of uploaded or recorded audio files.", buckets=BYTES_BUCKETS)
+AUDIO_DURATION_SECONDS = Histogram("audio_duration_seconds", "Duration of audio handed to Whisper.", buckets=AUDIO_SECONDS_BUCKETS)
+TRANSCRIPTION_SECONDS = Histogram("transcription_seconds", "Wall time spent in Whisper transcription.")
+TRANSCRIPTION_REALTIME_FACTOR = Histogram("transcription_realtime_factor", "Transcription wall time divided by audio duration (lower is faster).", buckets=RTF_BUCKETS)
+LLM_REQUEST_SECONDS = Histogram("llm_request_seconds", "Latency of OpenAI chat completion calls per extractor.", ("extractor", "outcome"))
+LLM_TOKENS = Histogram("llm_tokens", "Token usage reported by the OpenAI API per extractor.", ("extractor", "kind"), buckets=TOKEN_BUCKETS)
+DB_QUERY_SECONDS = Histogram("db_query_seconds", "Total SQLite time spent per request, by route.", ("route",))
+PROCESSING_STAGE_SECONDS = Histogram("processing_stage_seconds", "Wall time of each meeting processing stage.", ("stage",))
+LLM_STRUCTURED_OUTPUTS = Counter("llm_structured_outputs_total", "Structured extractor responses by how they parsed (parsed, salvaged, failed).", ("extractor", "outcome"))
+LLM_INVALID_ITEMS = Counter("llm_invalid_items_total", "Items dropped from structured extractor responses by validation.", ("extractor",))
+PROCESSING_QUEUE_DEPTH = Gauge("processing_queue_depth", "Meetings queued or being processed (inline: this process's pool; external: from the database).")
+PROCESSING_QUEUE_DEPTH.set(0)
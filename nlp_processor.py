@@ -2,9 +2,12 @@
 import openai
 import os
 import json
+import time
 import logging
 from dotenv import load_dotenv
 
+from metrics import LLM_REQUEST_SECONDS, LLM_TOKENS, LLM_STRUCTURED_OUTPUTS, LLM_INVALID_ITEMS
+
 load_dotenv() # Load environment variables from .env file
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(module)s - %(funcName)s - %(message)s')
@@ -27,8 +30,33 @@ else:
         logger.critical(f"CRITICAL: Failed to initialize OpenAI client: {e}", exc_info=True)
         client = None
 
-
-def get_llm_response(prompt_details: str, user_prompt: str, system_message: str = "You are a helpful assistant.", model: str = "gpt-3.5-turbo"):
+# Constrained output for the extractors: 'json_schema' (strict schema, needs a model that supports structured outputs),
+# 'json_object' (JSON mode, the default) or 'none' (free text, parsed tolerantly as before).
+LLM_RESPONSE_FORMAT = os.getenv("LLM_RESPONSE_FORMAT", "json_object").lower()
+_rejected_response_formats = set() # (model, type) pairs the API refused; not sent again by this process
+
+ACTION_ITEMS_SCHEMA = {
+    "type": "object",
+    "properties": {"action_items": {"type": "array", "items": {
+        "type": "object",
+        "properties": {"task": {"type": "string"}, "owner": {"type": ["string", "null"]}, "due_date": {"type": ["string", "null"]}},
+        "required": ["task", "owner", "due_date"], "additionalProperties": False}}},
+    "required": ["action_items"], "additionalProperties": False,
+}
+DECISIONS_SCHEMA = {
+    "type": "object",
+    "properties": {"decisions": {"type": "array", "items": {"type": "string"}}},
+    "required": ["decisions"], "additionalProperties": False,
+}
+
+def structured_response_format(name, schema):
+    """The response_format argument for an extractor under LLM_RESPONSE_FORMAT, or None for free text."""
+    if LLM_RESPONSE_FORMAT == "json_schema": return {"type": "json_schema", "json_schema": {"name": name, "schema": schema, "strict": True}}
+    if LLM_RESPONSE_FORMAT == "json_object": return {"type": "json_object"}
+    return None
+
+
+def get_llm_response(prompt_details: str, user_prompt: str, system_message: str = "You are a helpful assistant.", model: str = "gpt-3.5-turbo", response_format: dict = None):
     """
     Sends a prompt to the OpenAI API and returns the response content or an error message.
 
@@ -37,6 +65,8 @@ def get_llm_response(prompt_details: str, user_prompt: str, system_message: str
         user_prompt (str): The actual prompt to send to the LLM.
         system_message (str): The system message for the LLM.
         model (str): The OpenAI model to use.
+        response_format (dict): Optional OpenAI response_format (JSON mode or a JSON schema). If the model rejects
+            it, the request is retried once without it.
 
     Returns:
         str: The LLM's response content, or a string starting with "ERROR:" if an issue occurred.
@@ -50,14 +80,22 @@ def get_llm_response(prompt_details: str, user_prompt: str, system_message: str
     # To be very verbose for debugging (remove in production if too noisy):
     # logger.debug(f"Full prompt for {prompt_details}:\nSYSTEM: {system_message}\nUSER: {user_prompt[:500]}...") # Log first 500 chars
 
+    start_time = time.perf_counter(); outcome = "error"
     try:
+        if response_format and (model, response_format.get("type")) in _rejected_response_formats: response_format = None
+        request_kwargs = {"response_format": response_format} if response_format else {}
         response = client.chat.completions.create(
             model=model,
             messages=[
                 {"role": "system", "content": system_message},
                 {"role": "user", "content": user_prompt}
-            ]
+            ],
+            **request_kwargs
         )
+        outcome = "success"
+        if response.usage:
+            LLM_TOKENS.observe(response.usage.prompt_tokens or 0, extractor=prompt_details, kind="prompt")
+            LLM_TOKENS.observe(response.usage.completion_tokens or 0, extractor=prompt_details, kind="completion")
         content = response.choices[0].message.content
         if content:
             logger.info(f"{prompt_details}: API call successful. Response length: {len(content)} chars.")
@@ -78,6 +116,16 @@ def get_llm_response(prompt_details: str, user_prompt: str, system_message: str
         error_msg = f"ERROR: OpenAI API Authentication Error (check API Key): {e}"
         logger.error(f"{prompt_details}: {error_msg}", exc_info=True)
         return error_msg
+    except openai.BadRequestError as e:
+        if response_format and _is_response_format_error(e):
+            logger.warning(f"{prompt_details}: Model rejected response_format {response_format.get('type')} ({e}); retrying without it.")
+            _rejected_response_formats.add((model, response_format.get("type")))
+            # The rejected attempt is recorded on its own; the retry records itself, so skip the finally below.
+            LLM_REQUEST_SECONDS.observe(time.perf_counter() - start_time, extractor=prompt_details, outcome="format_rejected"); outcome = None
+            return get_llm_response(prompt_details, user_prompt, system_message, model)
+        error_msg = f"ERROR: OpenAI API Error: {e}"
+        logger.error(f"{prompt_details}: {error_msg}", exc_info=True)
+        return error_msg
     except openai.APIError as e: # Catch other OpenAI API errors
         error_msg = f"ERROR: OpenAI API Error: {e}"
         logger.error(f"{prompt_details}: {error_msg}", exc_info=True)
@@ -86,6 +134,93 @@ def get_llm_response(prompt_details: str, user_prompt: str, system_message: str
         error_msg = f"ERROR: An unexpected error occurred during API call for {prompt_details}: {e}"
         logger.error(f"{prompt_details}: {error_msg}", exc_info=True)
         return error_msg
+    finally:
+        if outcome is not None: LLM_REQUEST_SECONDS.observe(time.perf_counter() - start_time, extractor=prompt_details, outcome=outcome)
+
+def _is_response_format_error(error):
+    """Whether a 400 is about response_format itself, not e.g. context length; only then is the format dropped."""
+    if getattr(error, "param", None) == "response_format": return True
+    return "response_format" in f"{getattr(error, 'code', None) or ''} {getattr(error, 'message', None) or error}"
+
+_json_decoder = json.JSONDecoder()
+
+def parse_json_items(response_text: str, key: str):
+    """
+    Extracts the list of items from an extractor response, tolerating code fences, surrounding prose, a bare
+    array instead of {key: [...]}, and truncated or partly malformed output.
+
+    Elements are decoded one at a time with raw_decode, so a response that breaks off or goes wrong midway
+    still yields every element before the damage.
+
+    Returns:
+        tuple: (items, outcome) where outcome is 'parsed' (whole response valid), 'salvaged' (some elements
+        recovered from invalid JSON) or 'failed' (nothing recoverable).
+    """
+    text = response_text.strip()
+    start = min((i for i in (text.find('{'), text.find('[')) if i >= 0), default=-1)
+    if start < 0: return [], 'failed'
+    try:
+        value, _ = _json_decoder.raw_decode(text, start)
+        if isinstance(value, dict): value = value.get(key, next((v for v in value.values() if isinstance(v, list)), None))
+        if isinstance(value, list): return value, 'parsed'
+    except json.JSONDecodeError:
+        pass
+    # Salvage: find the array (after "key": if present) and decode its elements one by one. After a broken object,
+    # resume at the next '{', so only the damaged element (or the truncated tail) is lost.
+    key_match = text.find(f'"{key}"', start)
+    array_start = text.find('[', key_match if key_match >= 0 else start)
+    if array_start < 0: return [], 'failed'
+    items, pos = [], array_start + 1
+    while pos < len(text):
+        while pos < len(text) and text[pos] in ' \t\r\n,': pos += 1
+        if pos >= len(text) or text[pos] == ']': break
+        try:
+            item, pos = _json_decoder.raw_decode(text, pos)
+        except json.JSONDecodeError:
+            if text[pos] != '{': break
+            pos = text.find('{', pos + 1)
+            if pos < 0: break
+            continue
+        items.append(item)
+    return items, ('salvaged' if items else 'failed')
+
+def _clean_optional_text(value):
+    if value is None or isinstance(value, (dict, list)): return None
+    value = str(value).strip()
+    return value or None
+
+def validate_action_item(item):
+    """Returns a {'task', 'owner', 'due_date'} dict for a usable extracted item, or None to drop it."""
+    if isinstance(item, str): item = {'task': item}
+    if not isinstance(item, dict): return None
+    task = _clean_optional_text(item.get('task') or item.get('action') or item.get('description'))
+    if not task: return None
+    return {'task': task, 'owner': _clean_optional_text(item.get('owner')), 'due_date': _clean_optional_text(item.get('due_date'))}
+
+def validate_decision(item):
+    """Returns the decision text for a usable extracted decision, or None to drop it."""
+    if isinstance(item, dict): item = item.get('decision') or item.get('decision_text') or item.get('text')
+    if not isinstance(item, (str, int, float)) or isinstance(item, bool): return None
+    return _clean_optional_text(item)
+
+def _extract_structured(prompt_details, prompt, system_message, key, schema, validate):
+    """Requests constrained JSON for an extractor, then salvages and validates its items."""
+    response_text = get_llm_response(prompt_details, prompt, system_message, response_format=structured_response_format(key, schema))
+    if response_text.startswith("ERROR:"):
+        logger.error(f"{prompt_details} failed: {response_text}")
+        return [] # Return empty list on API error
+    logger.debug(f"{prompt_details}: parsing JSON. Raw response snippet: {response_text[:200]}")
+    raw_items, outcome = parse_json_items(response_text, key)
+    LLM_STRUCTURED_OUTPUTS.inc(extractor=prompt_details, outcome=outcome)
+    if outcome != 'parsed':
+        log = logger.warning if outcome == 'salvaged' else logger.error
+        log(f"{prompt_details}: response was not valid JSON; {outcome} {len(raw_items)} items. Response snippet: {response_text[:500]}")
+    items = [valid for valid in (validate(item) for item in raw_items) if valid is not None]
+    if len(items) < len(raw_items):
+        LLM_INVALID_ITEMS.inc(len(raw_items) - len(items), extractor=prompt_details)
+        logger.warning(f"{prompt_details}: dropped {len(raw_items) - len(items)} invalid items.")
+    logger.info(f"{prompt_details}: {len(items)} items extracted.")
+    return items
 
 def generate_summary(transcript: str) -> str:
     if not transcript or transcript.isspace():
@@ -130,18 +265,20 @@ def extract_action_items(transcript: str) -> list:
     - `owner`: person responsible (null or "" if not mentioned)
     - `due_date`: deadline or timeline (null or "N/A" if not mentioned)
 
-    Respond ONLY in a valid JSON list of objects like this:
+    Respond ONLY with a JSON object of this shape:
 
-    [
     {{
+    "action_items": [
+        {{
         "task": "Prepare the quarterly report",
         "owner": "Alice",
         "due_date": "Next Friday"
-    }},
-    ...
+        }},
+        ...
     ]
+    }}
 
-    If no action items are present, return an empty list `[]`. Please try to identify the action items atleast 1-2 from the summary, the more the better.
+    If no action items are present, return `{{"action_items": []}}`. Please try to identify the action items atleast 1-2 from the summary, the more the better.
 
     Transcript:
     ---
@@ -153,44 +290,7 @@ def extract_action_items(transcript: str) -> list:
 
     system_message = "You are an intelligent assistant skilled at extracting structured information like action items from text."
     logger.info("Requesting action item extraction from LLM.")
-    response_text = get_llm_response("Action Item Extraction", prompt, system_message)
-    
-    if response_text.startswith("ERROR:"):
-        logger.error(f"Action item extraction failed: {response_text}")
-        return [] # Return empty list on API error
-
-    parsed_items = []
-    try:
-        logger.debug(f"Attempting to parse action items JSON. Raw response snippet: {response_text[:200]}")
-        if '```json' in response_text:
-            json_str = response_text.split('```json')[1].split('```')[0].strip()
-        elif '```' in response_text and (response_text.strip().startswith('[') or response_text.strip().startswith('{')):
-            json_str = response_text.split('```')[1].split('```')[0].strip()
-        else:
-            json_str = response_text
-
-        items = json.loads(json_str)
-        
-        if isinstance(items, list):
-            for item in items:
-                if isinstance(item, dict):
-                    parsed_items.append({
-                        'task': item.get('task', 'N/A'),
-                        'owner': item.get('owner'),
-                        'due_date': item.get('due_date')
-                    })
-                else:
-                    logger.warning(f"Skipping non-dict item in action items: {item}")
-            logger.info(f"Successfully parsed {len(parsed_items)} action items.")
-        else:
-            logger.warning(f"LLM did not return a list for action items, but a {type(items)}. Response: {response_text[:200]}")
-            
-    except json.JSONDecodeError as e:
-        logger.error(f"Failed to parse JSON for action items: {e}. Response snippet: {response_text[:500]}", exc_info=True)
-    except Exception as e:
-        logger.error(f"Unexpected error processing action items after API call: {e}. Response snippet: {response_text[:500]}", exc_info=True)
-            
-    return parsed_items
+    return _extract_structured("Action Item Extraction", prompt, system_message, "action_items", ACTION_ITEMS_SCHEMA, validate_action_item)
 
 
 def extract_decisions(transcript: str) -> list:
@@ -201,16 +301,18 @@ def extract_decisions(transcript: str) -> list:
     prompt = f"""
     You are a structured-thinking assistant. From this meeting transcript, extract **all decisions** made by the participants.
 
-    Format your output as a JSON array of plain English strings, each summarizing one decision.
+    Format your output as a JSON object with a "decisions" array of plain English strings, each summarizing one decision.
     Do not include tasks or suggestions unless they were explicitly agreed as decisions.
 
-    Examples:
-    [
-    "The team will migrate to the new CRM system in Q2.",
-    "Budget for Project Alpha has been approved."
+    Example:
+    {{
+    "decisions": [
+        "The team will migrate to the new CRM system in Q2.",
+        "Budget for Project Alpha has been approved."
     ]
+    }}
 
-    If no decisions are found, return `[]`.
+    If no decisions are found, return `{{"decisions": []}}`.
 
     Transcript:
     ---
@@ -222,35 +324,7 @@ def extract_decisions(transcript: str) -> list:
 
     system_message = "You are an intelligent assistant skilled at extracting structured information like decisions from text."
     logger.info("Requesting decision extraction from LLM.")
-    response_text = get_llm_response("Decision Extraction", prompt, system_message)
-
-    if response_text.startswith("ERROR:"):
-        logger.error(f"Decision extraction failed: {response_text}")
-        return [] # Return empty list on API error
-
-    parsed_decisions = []
-    try:
-        logger.debug(f"Attempting to parse decisions JSON. Raw response snippet: {response_text[:200]}")
-        if '```json' in response_text:
-            json_str = response_text.split('```json')[1].split('```')[0].strip()
-        elif '```' in response_text and (response_text.strip().startswith('[') or response_text.strip().startswith('{')):
-            json_str = response_text.split('```')[1].split('```')[0].strip()
-        else:
-            json_str = response_text
-
-        decisions = json.loads(json_str)
-
-        if isinstance(decisions, list):
-            parsed_decisions = [str(d) for d in decisions if isinstance(d, (str, int, float))]
-            logger.info(f"Successfully parsed {len(parsed_decisions)} decisions.")
-        else:
-            logger.warning(f"LLM did not return a list for decisions, but a {type(decisions)}. Response: {response_text[:200]}")
-    except json.JSONDecodeError as e:
-        logger.error(f"Failed to parse JSON for decisions: {e}. Response snippet: {response_text[:500]}", exc_info=True)
-    except Exception as e:
-        logger.error(f"Unexpected error processing decisions after API call: {e}. Response snippet: {response_text[:500]}", exc_info=True)
-            
-    return parsed_decisions
+    return _extract_structured("Decision Extraction", prompt, system_message, "decisions", DECISIONS_SCHEMA, validate_decision)
 
 
 if __name__ == '__main__':
@@ -0,0 +1,88 @@
+# processing_worker.py
+"""
+Processing worker process: claims queued meetings from the database and runs transcription and NLP on them.
+
+Started by serve.py (one process per processing worker), or on its own next to any web tier running with
+PROCESSING_MODE=external:
+
+    PROCESSING_MODE=external python processing_worker.py
+
+SIGTERM/SIGINT stop the worker after the meeting it is processing, so a deploy never abandons a job midway.
+"""
+import os
+import signal
+import socket
+import logging
+import threading
+
+# In external mode importing app does not preload Whisper; the worker loads the model itself in run().
+os.environ.setdefault('PROCESSING_MODE', 'external')
+
+from database import get_db_connection, claim_next_job, record_worker_heartbeat, remove_worker
+from metrics import write_snapshot
+
+logger = logging.getLogger(__name__)
+
+POLL_INTERVAL_SECONDS = float(os.getenv('PROCESSING_POLL_INTERVAL', '1.0'))
+HEARTBEAT_INTERVAL_SECONDS = 10
+
+
+class ProcessingWorker:
+    def __init__(self, name=None):
+        self.name = name or f"{socket.gethostname()}:{os.getpid()}"
+        self.stopping = threading.Event()
+        self.current_meeting_id = None
+
+    def request_stop(self, signum=None, frame=None):
+        if not self.stopping.is_set():
+            logger.info(f"Worker {self.name}: stop requested" + (f"; finishing meeting {self.current_meeting_id} first." if self.current_meeting_id else "."))
+        self.stopping.set()
+
+    def _heartbeat_loop(self):
+        """Keeps processing_workers.heartbeat_at fresh, including during long transcriptions, for /readyz."""
+        conn = get_db_connection()
+        try:
+            while not self.stopping.wait(HEARTBEAT_INTERVAL_SECONDS):
+                try: record_worker_heartbeat(conn.cursor(), self.name, os.getpid(), self.current_meeting_id); conn.commit()
+                except Exception as e: logger.warning(f"Worker {self.name}: heartbeat failed: {e}")
+        finally:
+            conn.close()
+
+    def run(self):
+        from app import app, run_processing_job
+        from transcription import load_whisper_model
+        load_whisper_model() # load before the first claim, so the first job does not pay for it
+        conn = get_db_connection(); cursor = conn.cursor()
+        record_worker_heartbeat(cursor, self.name, os.getpid()); conn.commit()
+        threading.Thread(target=self._heartbeat_loop, name='heartbeat', daemon=True).start()
+        logger.info(f"Worker {self.name} started; polling for queued meetings every {POLL_INTERVAL_SECONDS}s.")
+        try:
+            while not self.stopping.is_set():
+                meeting_id = claim_next_job(cursor, self.name); conn.commit()
+                if meeting_id is None:
+                    self.stopping.wait(POLL_INTERVAL_SECONDS); continue
+                self.current_meeting_id = meeting_id
+                logger.info(f"Worker {self.name}: processing meeting {meeting_id}.")
+                try:
+                    with app.app_context(): run_processing_job(meeting_id)
+                except Exception as e:
+                    logger.error(f"Worker {self.name}: meeting {meeting_id} crashed: {e}", exc_info=True)
+                finally:
+                    self.current_meeting_id = None; write_snapshot() # publish this meeting's timings right away
+        finally:
+            self.stopping.set()
+            remove_worker(cursor, self.name); conn.commit(); conn.close()
+            logger.info(f"Worker {self.name} stopped.")
+
+
+def main(name=None):
+    if not logging.getLogger().hasHandlers():
+        logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    worker = ProcessingWorker(name)
+    signal.signal(signal.SIGTERM, worker.request_stop)
+    signal.signal(signal.SIGINT, worker.request_stop)
+    worker.run()
+
+
+if __name__ == '__main__':
+    main()
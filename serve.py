@@ -0,0 +1,152 @@
+# serve.py
+"""
+Production launcher: the web tier under gunicorn (several worker processes with threads) plus separate
+processing worker processes that transcribe and analyze uploaded meetings.
+
+    python serve.py                                   # defaults below, or the matching environment variables
+    python serve.py --bind 0.0.0.0:8000 --web-workers 4 --processing-workers 2
+
+The web tier runs with PROCESSING_MODE=external: uploads are only queued, so no request waits on Whisper and
+web workers never load the model. Processing workers claim queued meetings from the database one at a time.
+
+SIGTERM or Ctrl+C shuts down gracefully: gunicorn finishes in-flight requests (up to --graceful-timeout) and
+each processing worker finishes the meeting it is on (up to --shutdown-timeout). Meetings a killed worker left
+unfinished are queued again on the next start. Processing workers that crash are restarted.
+
+`python app.py` remains the single-process development server.
+"""
+import os
+import sys
+import time
+import signal
+import logging
+import secrets
+import argparse
+import socket
+import subprocess
+
+import database
+
+logger = logging.getLogger(__name__)
+
+PROJECT_ROOT = os.path.dirname(os.path.abspath(__file__))
+WORKER_RESTART_DELAY_SECONDS = 5
+
+
+def _default_web_workers():
+    return min((os.cpu_count() or 1) * 2 + 1, 8)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Run the meeting summarizer with gunicorn and processing worker processes.")
+    parser.add_argument('--bind', default=os.getenv('BIND', '0.0.0.0:5001'))
+    parser.add_argument('--web-workers', type=int, default=int(os.getenv('WEB_WORKERS', _default_web_workers())))
+    parser.add_argument('--web-threads', type=int, default=int(os.getenv('WEB_THREADS', '8')),
+                        help="Threads per web worker; each open progress stream (SSE) holds one.")
+    parser.add_argument('--processing-workers', type=int, default=int(os.getenv('PROCESSING_WORKERS', '1')),
+                        help="Processing worker processes, i.e. meetings transcribed concurrently (each loads its own Whisper model).")
+    parser.add_argument('--graceful-timeout', type=int, default=int(os.getenv('GRACEFUL_TIMEOUT', '30')),
+                        help="Seconds gunicorn gives in-flight requests on shutdown.")
+    parser.add_argument('--shutdown-timeout', type=int, default=int(os.getenv('PROCESSING_SHUTDOWN_TIMEOUT', '900')),
+                        help="Seconds processing workers get to finish their current meeting on shutdown.")
+    return parser.parse_args(argv)
+
+
+class Launcher:
+    def __init__(self, args):
+        self.args = args
+        self.stopping = False
+        self.web = None
+        self.workers = {} # slot -> Popen
+        env = dict(os.environ, PROCESSING_MODE='external')
+        env['PYTHONPATH'] = os.pathsep.join(filter(None, [PROJECT_ROOT, env.get('PYTHONPATH')]))
+        # Sessions and flash messages are signed; every web worker must use the same key.
+        env.setdefault('SECRET_KEY', secrets.token_hex(32))
+        # Every process writes its metrics here and /metrics sums them (see metrics.py).
+        self.metrics_dir = env.setdefault('METRICS_DIR', os.path.abspath('metrics_data')) # next to meetings.db
+        self.env = env
+
+    def _spawn(self, command):
+        # Own session: a terminal Ctrl+C reaches only the launcher, which then stops children gracefully.
+        return subprocess.Popen(command, env=self.env, start_new_session=True)
+
+    def start_web(self):
+        a = self.args
+        self.web = self._spawn([sys.executable, '-m', 'gunicorn', '--bind', a.bind, '--workers', str(a.web_workers),
+                                '--threads', str(a.web_threads), '--worker-class', 'gthread', '--timeout', '120',
+                                '--graceful-timeout', str(a.graceful_timeout), '--access-logfile', '-', 'app:app'])
+        logger.info(f"Web tier: gunicorn pid {self.web.pid} on {a.bind} ({a.web_workers} workers x {a.web_threads} threads).")
+
+    def start_worker(self, slot):
+        self.workers[slot] = self._spawn([sys.executable, '-m', 'processing_worker'])
+        logger.info(f"Processing worker {slot} started (pid {self.workers[slot].pid}).")
+
+    def requeue_worker_jobs(self, pid):
+        """Queues again the meeting a dead worker was processing and drops its heartbeat (workers are named host:pid)."""
+        conn = database.get_db_connection(); name = f"{socket.gethostname()}:{pid}"
+        try:
+            requeued = database.requeue_interrupted_jobs(conn.cursor(), name); database.remove_worker(conn.cursor(), name); conn.commit()
+            if requeued: logger.info(f"Re-queued {requeued} meetings from dead processing worker pid {pid}.")
+        finally:
+            conn.close()
+
+    def request_stop(self, signum=None, frame=None):
+        if self.stopping: return
+        self.stopping = True
+        logger.info("Shutting down: stopping new work, waiting for in-flight requests and meetings.")
+        for process in [self.web, *self.workers.values()]:
+            if process is not None and process.poll() is None: process.send_signal(signal.SIGTERM)
+
+    def _wait(self, process, timeout, label):
+        try:
+            process.wait(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            logger.warning(f"{label} (pid {process.pid}) did not stop within {timeout}s; killing it.")
+            process.kill(); process.wait()
+
+    def run(self):
+        database.init_db()
+        os.makedirs(self.metrics_dir, exist_ok=True)
+        for filename in os.listdir(self.metrics_dir): # counters restart with the deployment, as with a single process
+            if filename.endswith('.json') or filename.endswith('.tmp'): os.remove(os.path.join(self.metrics_dir, filename))
+        conn = database.get_db_connection()
+        requeued = database.requeue_interrupted_jobs(conn.cursor()); conn.commit(); conn.close()
+        if requeued: logger.info(f"Re-queued {requeued} meetings left unfinished by a previous run.")
+
+        signal.signal(signal.SIGTERM, self.request_stop)
+        signal.signal(signal.SIGINT, self.request_stop)
+        for slot in range(self.args.processing_workers): self.start_worker(slot)
+        self.start_web()
+
+        exit_code = 0; restart_at = {}
+        while not self.stopping:
+            time.sleep(1)
+            if self.stopping: break # signal arrived during the sleep; children are already stopping
+            if self.web.poll() is not None:
+                logger.error(f"gunicorn exited unexpectedly with code {self.web.returncode}; shutting down.")
+                exit_code = self.web.returncode or 1; self.request_stop(); break
+            for slot, process in list(self.workers.items()):
+                if process.poll() is None: continue
+                if slot not in restart_at:
+                    logger.error(f"Processing worker {slot} (pid {process.pid}) exited with code {process.returncode}; restarting in {WORKER_RESTART_DELAY_SECONDS}s.")
+                    self.requeue_worker_jobs(process.pid)
+                    restart_at[slot] = time.monotonic() + WORKER_RESTART_DELAY_SECONDS
+                elif time.monotonic() >= restart_at[slot]:
+                    del restart_at[slot]; self.start_worker(slot)
+
+        self._wait(self.web, self.args.graceful_timeout + 10, "gunicorn")
+        deadline = time.monotonic() + self.args.shutdown_timeout
+        for slot, process in self.workers.items():
+            self._wait(process, max(0, deadline - time.monotonic()), f"Processing worker {slot}")
+        logger.info("Shutdown complete.")
+        return exit_code
+
+
+def main(argv=None):
+    if not logging.getLogger().hasHandlers():
+        logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    return Launcher(parse_args(argv)).run()
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,7 +1,13 @@
 # transcription.py
 import whisper
 import os
+import time
+import types
 import logging
+import threading
+import importlib
+
+from metrics import AUDIO_DURATION_SECONDS, TRANSCRIPTION_SECONDS, TRANSCRIPTION_REALTIME_FACTOR
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -28,10 +34,35 @@ def load_whisper_model():
     return MODEL
 
 
-def transcribe_audio(audio_file_path):
+_progress = threading.local() # per-thread progress callback, so concurrent transcriptions report separately
+
+class _ProgressBar:
+    """
+    Stand-in for the tqdm bar Whisper drives while decoding (total = audio frames, update() per 30s window).
+    Forwards progress as a whole percent to the current thread's callback instead of drawing to the terminal.
+    """
+    def __init__(self, total=None, **kwargs):
+        self.total = total or 0; self.n = 0; self.callback = getattr(_progress, 'callback', None); self.last_percent = None
+    def __enter__(self): return self
+    def __exit__(self, *exc): return False
+    def update(self, n=1):
+        self.n += n
+        if self.callback is None or not self.total: return
+        percent = min(100, int(self.n * 100 / self.total))
+        if percent != self.last_percent:
+            self.last_percent = percent
+            try: self.callback(percent)
+            except Exception as e: logger.warning(f"Transcription progress callback failed: {e}")
+
+# whisper.transcribe calls tqdm.tqdm(...) through its module global; point that at the stand-in.
+importlib.import_module('whisper.transcribe').tqdm = types.SimpleNamespace(tqdm=_ProgressBar)
+
+
+def transcribe_audio(audio_file_path, progress_callback=None):
     """
     Transcribes the given audio file path using the pre-loaded Whisper model.
     The model is loaded on the first call to transcribe_audio or if load_whisper_model() is called explicitly.
+    progress_callback, if given, is called with the percent (0-100) of audio transcribed so far.
     """
     model_instance = load_whisper_model() # Ensures model is loaded
     
@@ -44,9 +75,20 @@ def transcribe_audio(audio_file_path):
         return None
     try:
         logger.info(f"Starting transcription for {audio_file_path}...")
+        # Decode once up front so the audio duration is known for the realtime-factor metric.
+        audio = whisper.load_audio(audio_file_path)
+        audio_duration = len(audio) / whisper.audio.SAMPLE_RATE
+        start_time = time.perf_counter()
         # For CPU, fp16 should be False. If you have a compatible GPU and CUDA setup, you might set it to True.
-        result = model_instance.transcribe(audio_file_path, fp16=False) 
-        logger.info(f"Transcription successful for {audio_file_path}.")
+        _progress.callback = progress_callback
+        try:
+            result = model_instance.transcribe(audio, fp16=False) 
+        finally:
+            _progress.callback = None
+        elapsed = time.perf_counter() - start_time
+        AUDIO_DURATION_SECONDS.observe(audio_duration); TRANSCRIPTION_SECONDS.observe(elapsed)
+        if audio_duration > 0: TRANSCRIPTION_REALTIME_FACTOR.observe(elapsed / audio_duration)
+        logger.info(f"Transcription successful for {audio_file_path}. Audio: {audio_duration:.1f}s, took {elapsed:.1f}s (RTF {elapsed / audio_duration if audio_duration else 0:.2f}).")
         return result["text"]
     except Exception as e:
         logger.error(f"Error during transcription: {e}", exc_info=True)